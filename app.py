@@ -1,7 +1,20 @@
+import io
+import math
+import os
+
 import streamlit as st
-import pandas as pd
-from typing import List, Tuple, Optional
-from decimal import Decimal, InvalidOperation
+
+from trade_size import IncrementalSizer, cached_risk_management_table, parse_risk_levels, table_cache
+from trade_size.atr import DEFAULT_ATR_MULTIPLIER, DEFAULT_ATR_PERIOD, PRICE_COLUMNS, ATRState, atr_stop_percentages
+from trade_size.disk_cache import disk_memoize
+from trade_size.grid import load_default_grid
+from trade_size.liquidation import CROSS, ISOLATED, LONG, SHORT, liquidation_report, load_default_brackets
+from trade_size.kelly import estimate_sizing, load_trade_journal, to_r_multiples
+from trade_size.montecarlo import simulate_equity
+from trade_size.paging import page_count, page_rows, select_rows
+from trade_size.parsing import MAX_INPUT_LENGTH
+from trade_size.profiling import Profiler, profile_run, profiling_requested, span
+from trade_size.sweeps import downsample_axis, downsample_grid, sweep_leverage, sweep_stop_loss_risk
 
 st.set_page_config(
     page_title="ماشین حساب مدیریت سرمایه",
@@ -9,210 +22,543 @@ st.set_page_config(
     layout="centered"
 )
 
+# Results depend only on the seed, not on how many processes ran them.
+simulate_equity_cached = disk_memoize("monte_carlo", ignore=("workers",))(simulate_equity)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+FONT_FILE = "fonts/Vazirmatn-subset.woff2"
+
 @st.cache_data
 def inject_custom_css():
-    st.markdown(
-        """
-        <style>
-        @import url('https://cdn.jsdelivr.net/gh/rastikerdar/vazirmatn@v33.003/Vazirmatn-font-face.css');
-
-        html, body, [class*="st-"] {
-            font-family: "Vazirmatn", sans-serif !important;
-            direction: rtl !important;
-            text-align: right;
-        }
+    with open(os.path.join(STATIC_DIR, "app.min.css"), encoding="utf-8") as handle:
+        css = handle.read()
 
-        h1, h2, h3, h4 {
-            font-family: "Vazirmatn", sans-serif !important;
-            text-align: right !important;
-        }
+    preload = ""
+    if os.path.exists(os.path.join(STATIC_DIR, FONT_FILE)):
+        preload = f'<link rel="preload" href="app/static/{FONT_FILE}" as="font" type="font/woff2" crossorigin>'
 
-        .stMarkdown, .stText, div[data-testid="stAlert"] {
-            text-align: right !important;
-            direction: rtl !important;
-        }
+    st.markdown(f"{preload}<style>{css}</style>", unsafe_allow_html=True)
 
-        div[data-testid="stDataFrame"] table thead tr th, 
-        div[data-testid="stDataFrame"] table tbody tr th,
-        div[data-testid="stDataFrame"] table tbody tr td {
-            font-family: "Vazirmatn", sans-serif !important;
-            text-align: center !important;
-            font-size: 15px !important;
-        }
-        
-        div[data-testid="stDataFrame"] table tbody tr th {
-            text-align: right !important;
-            font-weight: 600 !important;
-        }
-        
-        div[data-testid="stDataFrame"] table {
-            border-collapse: collapse !important;
-        }
-        
-        div[data-testid="stDataFrame"] table thead tr th {
-            background-color: #f0f2f6 !important;
-            font-weight: 600 !important;
-            padding: 12px 8px !important;
-        }
-        
-        div[data-testid="stDataFrame"] table tbody tr td {
-            padding: 10px 8px !important;
-        }
-        
-        div[data-testid="stNumberInput"] input {
-            direction: ltr !important; 
-            text-align: center !important;
-        }
-        
-        div[data-testid="stTextInput"] input {
-            direction: ltr !important;
-            text-align: left !important;
-        }
+def render_cache_stats():
+    stats = table_cache.stats()
+    with st.expander("🗄️ وضعیت کش محاسبات"):
+        c1, c2 = st.columns(2)
+        c1.metric("Hit", stats["hits"])
+        c2.metric("Miss", stats["misses"])
+        st.caption(
+            f"اندازه: {stats['size']}/{stats['maxsize']} ({stats['nbytes'] / 2**20:,.0f} MB) · "
+            f"نرخ Hit: {stats['hit_rate']:.0%} · "
+            f"حذف (LRU): {stats['evictions']} · "
+            f"منقضی (TTL): {stats['expirations']}"
+        )
 
-        div[data-testid="stButton"] { 
-            text-align: right !important; 
-            width: 100%; 
-        }
-        
-        .stButton button {
-            direction: rtl; 
-            margin-left: auto;
-            margin-right: 0;
-            width: auto;
-            border-radius: 8px;
-            font-weight: bold;
-        }
-        
-        div[data-testid="stMetric"] {
-            direction: rtl !important;
-            text-align: right !important;
-            font-family: "Vazirmatn", sans-serif !important;
-        }
-        
-        div[data-testid="stCheckbox"] {
-            direction: rtl !important;
-            text-align: right !important;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
+WIDE_TABLE_MAX_COLUMNS = 12
+TABLE_VIEWS = ("خودکار", "ستونی", "ردیفی (هر سطح ریسک یک ردیف)")
+PAGE_SIZES = (25, 50, 100, 250)
+RISK_LEVEL_LABEL = "سطح ریسک"
+
+def render_results_table(table_df, risk_levels, table_view):
+    # Only the visible slice is sent to the browser, so the column view is
+    # capped too; larger ladders fall back to the paged row view.
+    fits = len(table_df.columns) <= WIDE_TABLE_MAX_COLUMNS
+    wide = fits and table_view != TABLE_VIEWS[2]
+    if table_view == TABLE_VIEWS[1] and not fits:
+        st.info(
+            f"ℹ️ نمای ستونی حداکثر {WIDE_TABLE_MAX_COLUMNS} سطح ریسک را نشان می‌دهد؛ "
+            f"{len(table_df.columns):,} سطح به‌صورت ردیفی و صفحه‌بندی‌شده نمایش داده می‌شود."
+        )
+    currency = st.column_config.NumberColumn(format="dollar")
+
+    if wide:
+        st.dataframe(
+            table_df,
+            column_config={column: currency for column in table_df.columns},
+            use_container_width=True
+        )
+        return
+
+    if len(risk_levels) <= PAGE_SIZES[0]:
+        long_df = table_df.T
+        long_df.index.name = RISK_LEVEL_LABEL
+    else:
+        long_df = paged_long_table(table_df, risk_levels)
+
+    st.dataframe(
+        long_df,
+        column_config={column: currency for column in table_df.index},
+        use_container_width=True
     )
 
-def validate_inputs(capital: float, stop_loss_percentage: float, risk_levels: List[float], leverage: float) -> Optional[str]:
-    if capital <= 0:
-        return "سرمایه باید بیشتر از صفر باشد."
-    
-    if stop_loss_percentage <= 0:
-        return "درصد حد ضرر باید بیشتر از صفر باشد."
-    
-    if stop_loss_percentage >= 100:
-        return "درصد حد ضرر نمی‌تواند بیشتر یا مساوی ۱۰۰٪ باشد."
+def paged_long_table(table_df, risk_levels):
+    import numpy as np
+    import pandas as pd
+
+    values = table_df.to_numpy()
+    columns = {label: values[row] for row, label in enumerate(table_df.index)}
+    columns[RISK_LEVEL_LABEL] = np.asarray(risk_levels, dtype=np.float64)
+
+    c1, c2, c3 = st.columns(3)
+    sort_by = c1.selectbox("مرتب‌سازی بر اساس", list(columns), index=len(columns) - 1, key="page_sort_by")
+    descending = c2.checkbox("نزولی", key="page_descending")
+    page_size = c3.selectbox("ردیف در هر صفحه", PAGE_SIZES, index=1, key="page_size")
+
+    c1, c2 = st.columns(2)
+    lower = c1.number_input("حداقل سطح ریسک (٪)", value=None, min_value=0.0, key="page_risk_min")
+    upper = c2.number_input("حداکثر سطح ریسک (٪)", value=None, min_value=0.0, key="page_risk_max")
+
+    rows = select_rows(columns, sort_by, descending, {RISK_LEVEL_LABEL: (lower, upper)})
+    pages = page_count(len(rows), page_size)
+    page = st.number_input(f"صفحه (از {pages})", min_value=1, max_value=pages, value=1, step=1, key="page_number")
+    visible = page_rows(rows, page, page_size)
+
+    st.caption(f"{len(rows):,} سطح از {len(risk_levels):,} · نمایش {len(visible):,} ردیف")
+    return pd.DataFrame(
+        {label: values[row][visible] for row, label in enumerate(table_df.index)},
+        index=pd.Index(table_df.columns[visible], name=RISK_LEVEL_LABEL)
+    )
+
+def render_results(results, table_view):
+    capital = results["capital"]
+    stop_loss_percentage = results["stop_loss_percentage"]
+    leverage = results["leverage"]
+    use_leverage = results["use_leverage"]
+    risk_levels = results["risk_levels"]
+
+    if use_leverage:
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("سرمایه", f"${capital:,.0f}")
+        c2.metric("حد ضرر", f"{stop_loss_percentage:.2f}%")
+        c3.metric("اهرم", f"{leverage:.0f}×")
+        c4.metric("تعداد سطوح", len(risk_levels))
+    else:
+        c1, c2, c3 = st.columns(3)
+        c1.metric("سرمایه", f"${capital:,.0f}")
+        c2.metric("حد ضرر", f"{stop_loss_percentage:.2f}%")
+        c3.metric("تعداد سطوح", len(risk_levels))
+
+    st.divider()
     
-    if leverage < 1:
-        return "اهرم باید حداقل ۱ باشد."
+    st.subheader("📊 جدول سایز پوزیشن")
     
-    if leverage > 125:
-        return "اهرم نمی‌تواند بیشتر از ۱۲۵ باشد."
+    with span("render_table"):
+        render_results_table(results["table_df"], risk_levels, table_view)
     
-    if not risk_levels:
-        return "لطفاً حداقل یک سطح ریسک وارد کنید."
+    st.info("💡 **ردیف اول (میزان ریسک دلاری):** این مقدار نشان‌دهنده **حداکثر مبلغی** است که شما مجازید در این معامله، در صورت رسیدن به حد ضرر، از دست بدهید.")
     
-    for risk in risk_levels:
-        if risk <= 0:
-            return "تمام سطوح ریسک باید بیشتر از صفر باشند."
-        if risk >= 100:
-            return "سطوح ریسک نمی‌توانند بیشتر یا مساوی ۱۰۰٪ باشند."
+    if use_leverage:
+        st.info("📊 **ردیف دوم (سایز پوزیشن):** ارزش کل معامله‌ای که باید باز کنید.")
+        st.info(f"💳 **ردیف سوم (مارجین لازم با اهرم {leverage:.0f}×):** با استفاده از اهرم {leverage:.0f}×، فقط کافیه این مقدار (سایز پوزیشن ÷ {leverage:.0f}) از سرمایه‌ات رو وارد کنی!")
+    else:
+        st.info("🚀 **ردیف دوم (سایز پوزیشن):** این مقدار نشان‌دهنده **ارزش کل دلاری** است که باید با آن وارد معامله شوید تا در صورت فعال شدن حد ضرر، دقیقا مبلغ ردیف اول را از دست بدهید.")
     
-    return None
+    st.caption("💡 این محاسبات بر اساس فرمول‌های استاندارد مدیریت ریسک در بازارهای مالی انجام شده‌اند.")
 
-def parse_risk_levels(risk_input: str) -> Tuple[Optional[List[float]], Optional[str]]:
-    if not risk_input or not risk_input.strip():
-        return None, "لطفاً سطوح ریسک را وارد کنید."
-    
-    try:
-        risk_levels = []
-        parts = risk_input.replace('،', ',').split(',')
-        
-        for part in parts:
-            part = part.strip()
-            if part:
-                try:
-                    value = float(part)
-                    risk_levels.append(value)
-                except ValueError:
-                    return None, f"مقدار '{part}' معتبر نیست. لطفاً فقط اعداد وارد کنید."
-        
-        if not risk_levels:
-            return None, "لطفاً حداقل یک سطح ریسک معتبر وارد کنید."
-        
-        risk_levels = sorted(set(risk_levels))
-        
-        return risk_levels, None
-        
-    except Exception as e:
-        return None, f"خطا در پردازش: {str(e)}"
-
-def create_risk_management_table(
-    capital: float, 
-    stop_loss_percentage: float, 
-    risk_levels: List[float],
-    leverage: float = 1.0
-) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
-    
-    error = validate_inputs(capital, stop_loss_percentage, risk_levels, leverage)
-    if error:
-        return None, error
-    
-    try:
-        capital_dec = Decimal(str(capital))
-        sl_factor = Decimal(str(stop_loss_percentage)) / Decimal('100')
-        leverage_dec = Decimal(str(leverage))
-        
-        data = {}
-        for risk_percent in risk_levels:
-            risk_factor = Decimal(str(risk_percent)) / Decimal('100')
-            
-            dollar_risk = float(capital_dec * risk_factor)
-            position_size_dec = (capital_dec * risk_factor) / sl_factor
-            position_size = float(position_size_dec)
-            
-            margin_required = float(position_size_dec / leverage_dec)
-            
-            col_name = f"{risk_percent}%"
-            
-            if leverage > 1:
-                data[col_name] = [
-                    dollar_risk,
-                    position_size,
-                    margin_required
-                ]
-            else:
-                data[col_name] = [dollar_risk, position_size]
-        
-        if leverage > 1:
-            index_labels = [
-                '💰 میزان ریسک',
-                '📊 سایز پوزیشن',
-                '💳 مارجین لازم (با اهرم)'
-            ]
+LIQUIDATION_SIDES = {"لانگ (خرید)": LONG, "شورت (فروش)": SHORT}
+MARGIN_MODES = {"ایزوله": ISOLATED, "کراس": CROSS}
+LIQUIDATION_MAX_LISTED = 10
+
+def render_liquidation(capital, stop_loss_percentage, risk_levels, leverage):
+    brackets = load_default_brackets()
+    if not brackets:
+        st.caption("فایل پله‌های مارجین نگهداری (data/brackets.json) پیدا نشد؛ قیمت لیکوئید محاسبه نمی‌شود.")
+        return
+
+    st.subheader("🔥 فاصله تا قیمت لیکوئید")
+    c1, c2, c3 = st.columns(3)
+    symbol = c1.selectbox("جدول پله‌ها", list(brackets), key="liquidation_symbol")
+    side = c2.radio("جهت", list(LIQUIDATION_SIDES), horizontal=True, key="liquidation_side")
+    margin_mode = c3.radio("نوع مارجین", list(MARGIN_MODES), horizontal=True, key="liquidation_mode")
+
+    with span("liquidation"):
+        report, stop_past_liquidation, rejected = liquidation_report(
+            capital,
+            stop_loss_percentage,
+            risk_levels,
+            leverage,
+            brackets[symbol],
+            LIQUIDATION_SIDES[side],
+            MARGIN_MODES[margin_mode]
+        )
+
+    for mask, message in (
+        (stop_past_liquidation, "حد ضرر بعد از قیمت لیکوئید است؛ پوزیشن قبل از رسیدن به حد ضرر لیکوئید می‌شود"),
+        (rejected, f"اهرم {leverage:.0f}× برای این سایز پوزیشن در پله مارجین مجاز نیست"),
+    ):
+        flagged = report.columns[mask]
+        if len(flagged):
+            listed = "، ".join(flagged[:LIQUIDATION_MAX_LISTED])
+            more = f" و {len(flagged) - LIQUIDATION_MAX_LISTED:,} سطح دیگر" if len(flagged) > LIQUIDATION_MAX_LISTED else ""
+            st.error(f"🚨 {message}: {listed}{more}")
+
+    if len(risk_levels) <= WIDE_TABLE_MAX_COLUMNS:
+        st.dataframe(
+            report,
+            column_config={column: st.column_config.NumberColumn(format="%.2f") for column in report.columns},
+            use_container_width=True
+        )
+    else:
+        st.caption(
+            f"کمترین فاصله تا لیکوئید: {report.iloc[0].min():.2f}٪ — "
+            f"بیشترین: {report.iloc[0].max():.2f}٪ (حد ضرر: {stop_loss_percentage:.2f}٪)"
+        )
+
+HEATMAP_MAX_CELLS = 200
+
+def render_heatmap_sweep(capital, leverage):
+    import numpy as np
+    import plotly.graph_objects as go
+
+    with st.expander("🗺️ نقشه حرارتی حد ضرر × سطح ریسک"):
+        # Widgets inside an expander run even while it is closed, so the
+        # sweep only runs once it is asked for.
+        if not st.checkbox("محاسبه نقشه", value=False, key="heatmap_show"):
+            return
+        c1, c2, c3 = st.columns(3)
+        sl_min = c1.number_input("حداقل حد ضرر (٪)", min_value=0.01, max_value=99.99, value=0.25, step=0.25, key="heat_sl_min")
+        sl_max = c2.number_input("حداکثر حد ضرر (٪)", min_value=0.01, max_value=99.99, value=10.0, step=0.25, key="heat_sl_max")
+        sl_points = c3.number_input("تعداد نقاط حد ضرر", min_value=2, max_value=1000, value=400, step=50, key="heat_sl_points")
+
+        c1, c2, c3 = st.columns(3)
+        risk_min = c1.number_input("حداقل ریسک (٪)", min_value=0.01, max_value=99.99, value=0.1, step=0.1, key="heat_risk_min")
+        risk_max = c2.number_input("حداکثر ریسک (٪)", min_value=0.01, max_value=99.99, value=5.0, step=0.1, key="heat_risk_max")
+        risk_points = c3.number_input("تعداد نقاط ریسک", min_value=2, max_value=1000, value=400, step=50, key="heat_risk_points")
+
+        metric = st.radio("شاخص", ("📊 سایز پوزیشن", "💳 مارجین لازم"), horizontal=True, key="heat_metric")
+
+        if sl_min >= sl_max or risk_min >= risk_max:
+            st.error("❌ مقدار حداقل باید کمتر از حداکثر باشد.")
+            return
+
+        with span("heatmap_sweep"):
+            stop_losses = np.linspace(sl_min, sl_max, int(sl_points))
+            risks = np.linspace(risk_min, risk_max, int(risk_points))
+            position_size, margin_required = sweep_stop_loss_risk(capital, stop_losses, risks, leverage)
+            values = position_size if metric == "📊 سایز پوزیشن" else margin_required
+            z, y, x = downsample_grid(values, stop_losses, risks, HEATMAP_MAX_CELLS, HEATMAP_MAX_CELLS)
+
+        figure = go.Figure(go.Heatmap(
+            z=z,
+            x=x,
+            y=y,
+            colorscale="Viridis",
+            colorbar={"title": "USD"},
+            hovertemplate="ریسک %{x:.2f}٪<br>حد ضرر %{y:.2f}٪<br>$%{z:,.2f}<extra></extra>"
+        ))
+        figure.update_layout(
+            xaxis_title="سطح ریسک (٪)",
+            yaxis_title="حد ضرر (٪)",
+            margin={"l": 10, "r": 10, "t": 30, "b": 10},
+            height=480
+        )
+        st.plotly_chart(figure, use_container_width=True)
+        st.caption(f"{len(stop_losses) * len(risks):,} نقطه محاسبه شد · {z.size:,} خانه نمایش داده شد")
+
+LEVERAGE_SWEEP_MAX_LINES = 20
+
+def render_leverage_sweep(capital, stop_loss_percentage, risk_levels):
+    import numpy as np
+    import plotly.graph_objects as go
+
+    with st.expander("⚡ مقایسه مارجین لازم در اهرم ۱× تا ۱۲۵×"):
+        if not st.checkbox("محاسبه نمودار", value=False, key="leverage_sweep_show"):
+            return
+        chart = st.radio("نوع نمودار", ("خطی", "سطحی (Surface)"), horizontal=True, key="leverage_chart")
+        log_scale = st.checkbox("محور عمودی لگاریتمی", value=True, key="leverage_log")
+
+        # Only the risk levels that are drawn are swept, so a long risk list
+        # never becomes a len(risks) x 125 matrix. Margin is linear in risk,
+        # so sweeping block-mean risks equals block-averaging the full sweep.
+        risks = np.asarray(risk_levels, dtype=np.float64)
+        if chart == "خطی":
+            rows = np.unique(np.linspace(0, len(risks) - 1, min(len(risks), LEVERAGE_SWEEP_MAX_LINES)).astype(int))
+            swept_risks = risks[rows]
         else:
-            index_labels = ['💰 میزان ریسک', '📊 سایز پوزیشن']
-        
-        df = pd.DataFrame(data, index=index_labels)
-        
-        return df, None
-        
-    except (InvalidOperation, ValueError, ZeroDivisionError) as e:
-        return None, f"خطا در محاسبات: {str(e)}"
+            swept_risks = downsample_axis(risks, HEATMAP_MAX_CELLS)
+        with span("leverage_sweep"):
+            leverages, margins = sweep_leverage(capital, stop_loss_percentage, swept_risks)
+
+        if chart == "خطی":
+            figure = go.Figure([
+                go.Scatter(
+                    x=leverages,
+                    y=margin,
+                    mode="lines",
+                    name=f"{risk:g}%",
+                    hovertemplate="اهرم %{x:.0f}×<br>مارجین $%{y:,.2f}<extra>%{fullData.name}</extra>"
+                )
+                for risk, margin in zip(swept_risks, margins)
+            ])
+            figure.update_layout(
+                xaxis_title="اهرم (×)",
+                yaxis_title="مارجین لازم (USD)",
+                yaxis_type="log" if log_scale else "linear"
+            )
+            if len(rows) < len(risks):
+                st.caption(f"{len(rows)} خط از {len(risks):,} سطح ریسک نمایش داده شده است.")
+        else:
+            figure = go.Figure(go.Surface(x=leverages, y=swept_risks, z=margins, colorscale="Viridis"))
+            figure.update_layout(scene={
+                "xaxis_title": "اهرم (×)",
+                "yaxis_title": "ریسک (٪)",
+                "zaxis_title": "مارجین (USD)",
+                "zaxis_type": "log" if log_scale else "linear",
+            })
+
+        figure.update_layout(margin={"l": 10, "r": 10, "t": 30, "b": 10}, height=480)
+        st.plotly_chart(figure, use_container_width=True)
+
+MONTE_CARLO_MAX_LEVELS = 50
+
+def render_monte_carlo(risk_levels):
+    import numpy as np
+
+    with st.expander("🎲 شبیه‌سازی مونت‌کارلو سرمایه و افت سرمایه"):
+        c1, c2, c3 = st.columns(3)
+        win_rate = c1.number_input("نرخ برد (٪)", min_value=0.0, max_value=100.0, value=45.0, step=1.0, key="mc_win_rate")
+        reward_risk = c2.number_input("نسبت سود به ضرر (R)", min_value=0.1, max_value=20.0, value=2.0, step=0.1, key="mc_reward_risk")
+        ruin = c3.number_input("آستانه ورشکستگی (٪ افت)", min_value=1.0, max_value=99.0, value=50.0, step=5.0, key="mc_ruin")
+
+        c1, c2, c3, c4 = st.columns(4)
+        trades = c1.number_input("تعداد معاملات", min_value=1, max_value=10_000, value=200, step=50, key="mc_trades")
+        paths = c2.number_input("تعداد مسیرها", min_value=100, max_value=1_000_000, value=10_000, step=1_000, key="mc_paths")
+        seed = c3.number_input("Seed", min_value=0, value=42, step=1, key="mc_seed")
+        workers = c4.number_input(
+            "تعداد پروسه",
+            min_value=1,
+            max_value=os.cpu_count() or 1,
+            value=1,
+            key="mc_workers",
+            help="فقط برای شبیه‌سازی‌های بزرگ (مسیرها × معاملات) پروسه جدا ساخته می‌شود."
+        )
+
+        levels = np.asarray(risk_levels, dtype=np.float64)
+        if len(levels) > MONTE_CARLO_MAX_LEVELS:
+            levels = levels[np.unique(np.linspace(0, len(levels) - 1, MONTE_CARLO_MAX_LEVELS).astype(int))]
+            st.caption(f"{len(levels)} سطح از {len(risk_levels):,} سطح ریسک شبیه‌سازی می‌شود.")
+
+        # A stored result is shown only while the inputs that produced it
+        # are unchanged, so a new ladder never sits under an old simulation.
+        inputs = (tuple(levels.tolist()), win_rate, reward_risk, int(trades), int(paths), int(seed), ruin)
+        if st.button("▶️ اجرای شبیه‌سازی", key="mc_run"):
+            with span("monte_carlo"), st.spinner("در حال شبیه‌سازی..."):
+                st.session_state.monte_carlo = inputs, simulate_equity_cached(
+                    levels.tolist(),
+                    win_rate / 100.0,
+                    reward_risk,
+                    int(trades),
+                    int(paths),
+                    seed=int(seed),
+                    workers=int(workers),
+                    ruin_drawdown_percentage=ruin
+                )
+
+        stored_inputs, result = st.session_state.get("monte_carlo", (None, None))
+        if stored_inputs == inputs:
+            st.dataframe(
+                result,
+                column_config={column: st.column_config.NumberColumn(format="%.2f") for column in result.columns},
+                use_container_width=True
+            )
+        elif stored_inputs is not None:
+            st.caption("ورودی‌ها تغییر کرده‌اند؛ برای نتیجه جدید شبیه‌سازی را دوباره اجرا کنید.")
+
+DEFAULT_RISK_INPUTS = "0.25, 0.5, 1.0, 2.0"
+DEFAULT_STOP_LOSS = 1.5
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def latest_atr_stop(data, file_name, period, multiplier):
+    import pandas as pd
+
+    buffer = io.BytesIO(data)
+    if file_name.lower().endswith(".parquet"):
+        prices = pd.read_parquet(buffer, columns=list(PRICE_COLUMNS))
+    else:
+        prices = pd.read_csv(buffer, usecols=list(PRICE_COLUMNS))
+    high, low, close = (pd.to_numeric(prices[name], errors="coerce").to_numpy(dtype="float64") for name in PRICE_COLUMNS)
+    # The state holds the last valid bar, so a blank final row is skipped.
+    state = ATRState(period)
+    state.update_many(high, low, close)
+    atr = math.nan if state.atr is None else state.atr
+    return atr, math.nan if state.previous_close is None else state.previous_close, len(close)
+
+def apply_stop_loss(stop_loss_percentage):
+    st.session_state.stop_loss_percentage = min(max(round(stop_loss_percentage, 2), 0.01), 99.99)
+
+def render_atr_stop():
+    with st.expander("📐 حد ضرر از ATR"):
+        uploaded = st.file_uploader(
+            "فایل قیمت (CSV یا Parquet) با ستون‌های high، low و close",
+            type=["csv", "parquet"],
+            key="atr_prices"
+        )
+        c1, c2 = st.columns(2)
+        period = c1.number_input("دوره ATR", min_value=1, max_value=500, value=DEFAULT_ATR_PERIOD, key="atr_period")
+        multiplier = c2.number_input(
+            "ضریب ATR", min_value=0.1, max_value=20.0, value=DEFAULT_ATR_MULTIPLIER, step=0.1, key="atr_multiplier"
+        )
+        if uploaded is None:
+            return
+
+        try:
+            with span("atr"):
+                atr, close, bars = latest_atr_stop(uploaded.getvalue(), uploaded.name, int(period), multiplier)
+        except (ValueError, KeyError) as exc:
+            st.error(f"❌ {exc}")
+            return
+
+        if atr != atr:
+            st.warning(f"⚠️ برای ATR با دوره {int(period)} حداقل {int(period)} کندل لازم است ({bars} کندل موجود است).")
+            return
+
+        stop_loss_percentage = float(atr_stop_percentages(atr, close, multiplier))
+        st.caption(f"ATR آخرین کندل: {atr:,.6g} — قیمت بسته‌شدن: {close:,.6g} — حد ضرر: {stop_loss_percentage:.2f}٪")
+        st.button(
+            "📥 استفاده به‌عنوان حد ضرر",
+            key="atr_apply",
+            on_click=apply_stop_loss,
+            args=(stop_loss_percentage,)
+        )
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def estimate_journal(data, file_name):
+    buffer = io.BytesIO(data)
+    buffer.name = file_name
+    values, kind = load_trade_journal(buffer)
+    r_multiples = values if kind == "r" else to_r_multiples(values)
+    return estimate_sizing(r_multiples), kind
+
+def apply_risk_inputs(risk_percentages):
+    levels = [round(value, 4) for value in risk_percentages if 0 < value < 100]
+    st.session_state.risk_inputs = ", ".join(f"{value:g}" for value in sorted(set(levels)))
+
+def render_kelly_estimator():
+    import plotly.graph_objects as go
+
+    with st.expander("📒 تخمین سطح ریسک از ژورنال معاملات (Kelly / Optimal f)"):
+        uploaded = st.file_uploader(
+            "فایل ژورنال (CSV یا Parquet) با ستون r_multiple یا pnl",
+            type=["csv", "parquet"],
+            key="kelly_journal"
+        )
+        if uploaded is None:
+            return
+
+        try:
+            with span("kelly"):
+                estimate, kind = estimate_journal(uploaded.getvalue(), uploaded.name)
+        except (ValueError, KeyError) as exc:
+            st.error(f"❌ {exc}")
+            return
+
+        if kind == "pnl":
+            st.caption("ستون PnL با میانگین زیان‌ها به R تبدیل شد (1R = میانگین زیان).")
+
+        c1, c2, c3 = st.columns(3)
+        c1.metric("تعداد معاملات", f"{estimate.trades:,}")
+        c2.metric("نرخ برد", f"{estimate.win_rate * 100:.1f}%")
+        c3.metric("نسبت سود به ضرر", f"{estimate.payoff_ratio:.2f}")
+
+        risk_percentages = estimate.risk_percentages()
+        if estimate.kelly_fraction <= 0:
+            st.warning("⚠️ این ژورنال لبه مثبت ندارد؛ Kelly ریسک صفر پیشنهاد می‌کند.")
+            return
+
+        st.dataframe(
+            {"ریسک هر معامله (٪)": risk_percentages},
+            column_config={"ریسک هر معامله (٪)": st.column_config.NumberColumn(format="%.3f")},
+            use_container_width=True
+        )
+        figure = go.Figure(go.Scatter(
+            x=estimate.growth_fractions * 100,
+            y=estimate.growth_rates,
+            mode="lines",
+            hovertemplate="ریسک %{x:.2f}٪<br>رشد %{y:.5f}<extra></extra>"
+        ))
+        for name, value in risk_percentages.items():
+            figure.add_vline(x=value, line_dash="dot", annotation_text=name)
+        figure.update_layout(
+            xaxis_title="ریسک هر معامله (٪)",
+            yaxis_title="رشد لگاریتمی میانگین هر معامله",
+            margin={"l": 10, "r": 10, "t": 30, "b": 10},
+            height=380
+        )
+        st.plotly_chart(figure, use_container_width=True)
+        st.button(
+            "📥 استفاده به‌عنوان سطوح ریسک",
+            key="kelly_apply",
+            on_click=apply_risk_inputs,
+            args=(list(risk_percentages.values()),)
+        )
+
+def get_profiler():
+    if not (profiling_requested() or st.query_params.get("profile") == "1"):
+        return None
+    if "profiler" not in st.session_state:
+        st.session_state.profiler = Profiler()
+    return st.session_state.profiler
+
+def render_profiler_panel(profiler):
+    percentiles = profiler.percentiles()
+    rows = {
+        name: {
+            "آخرین اجرا (ms)": profiler.last_run.get(name, 0.0),
+            "تعداد": profiler.last_counts.get(name, 0),
+            "p50": stats[50],
+            "p90": stats[90],
+            "p99": stats[99],
+        }
+        for name, stats in percentiles.items()
+    }
+    with st.expander("🛠️ پروفایل اجرا", expanded=True):
+        st.caption(f"تعداد اجرا: {profiler.runs}")
+        st.dataframe(rows, use_container_width=True)
+        st.download_button(
+            "⬇️ دانلود Trace (chrome://tracing / Perfetto)",
+            profiler.to_chrome_trace(),
+            file_name="trade_size_trace.json",
+            mime="application/json"
+        )
 
 def main():
-    inject_custom_css()
+    profiler = get_profiler()
+    with profile_run(profiler):
+        panel = render_app()
+    if panel is not None:
+        with panel.container():
+            render_profiler_panel(profiler)
+
+def render_app():
+    with span("inject_css"):
+        inject_custom_css()
 
     st.title('🤖 ماشین حساب مدیریت سرمایه')
     st.markdown("محاسبه دقیق **سایز پوزیشن** بر اساس سرمایه کل، درصد ریسک و اهرم.")
     
     st.divider()
 
+    return calculator()
+
+# A fragment: interacting with any widget below reruns only this function,
+# not the CSS injection and page chrome above it. The cache and profiler
+# panels live inside it so fragment reruns refresh them too.
+@st.fragment
+def calculator():
+    profiler = get_profiler()
+    with profile_run(profiler) as own_run, span("calculator"):
+        render_calculator()
+
+    render_cache_stats()
+    if profiler is None:
+        return None
+    # In a full rerun the run is still open here; main() fills the panel
+    # once it has ended.
+    panel = st.empty()
+    if own_run:
+        with panel.container():
+            render_profiler_panel(profiler)
+    return panel
+
+def render_calculator():
     with st.container():
         col1, col2 = st.columns(2)
         
@@ -227,16 +573,20 @@ def main():
             )
         
         with col2:
+            if "stop_loss_percentage" not in st.session_state:
+                st.session_state.stop_loss_percentage = DEFAULT_STOP_LOSS
             stop_loss_percentage = st.number_input(
                 'حد ضرر معامله (٪)', 
                 min_value=0.01,
                 max_value=99.99,
-                value=1.5, 
+                key="stop_loss_percentage",
                 step=0.1,
                 format="%.2f",
                 help="درصد افت قیمت تا حد ضرر (مثلاً ۱.۵٪ یعنی SL در ۱.۵٪ پایین‌تر از قیمت ورود)"
             )
 
+    render_atr_stop()
+
     use_leverage = st.checkbox('⚡ استفاده از اهرم (Leverage)', value=False)
     
     leverage = 1.0
@@ -253,61 +603,61 @@ def main():
         
         st.warning(f"⚠️ **هشدار:** با اهرم {leverage:.0f}×، ریسک معامله شما {leverage:.0f} برابر می‌شود. با احتیاط استفاده کنید!")
 
+    render_kelly_estimator()
+
+    if "risk_inputs" not in st.session_state:
+        st.session_state.risk_inputs = DEFAULT_RISK_INPUTS
     risk_inputs_str = st.text_input(
         "سطوح ریسک مورد نظر (٪) - با کاما جدا کنید:",
-        value="0.25, 0.5, 1.0, 2.0",
-        help="مثال: 0.5, 1, 2 یا 0.25, 0.5, 1, 1.5, 2, 3"
+        key="risk_inputs",
+        max_chars=MAX_INPUT_LENGTH,
+        help="مثال: 0.5, 1, 2 یا 0.25, 0.5, 1, 1.5, 2, 3 — بازه: 0.25:3:0.25 (شروع:پایان:گام) — نردبان هندسی: 0.1*2^0..6"
     )
 
-    if st.button('🧮 محاسبه کن', type="primary"):
+    table_view = st.radio("نمایش جدول", TABLE_VIEWS, horizontal=True)
+
+    # Recalculates on every committed input change. Number and text inputs
+    # commit on Enter/blur and a newer change interrupts a running rerun, so
+    # bursts of edits collapse into one computation.
+    with span("parse"):
         risk_levels, parse_error = parse_risk_levels(risk_inputs_str)
-        
-        if parse_error:
-            st.error(f"❌ {parse_error}")
-            return
-        
-        table_df, calc_error = create_risk_management_table(
+    
+    if parse_error:
+        st.error(f"❌ {parse_error}")
+        return
+    
+    if "sizer" not in st.session_state:
+        st.session_state.sizer = IncrementalSizer()
+    
+    with span("compute"):
+        table_df, calc_error = cached_risk_management_table(
             capital, 
             stop_loss_percentage, 
             risk_levels,
-            leverage
+            leverage,
+            sizer=st.session_state.sizer,
+            grid=load_default_grid()
         )
 
-        if calc_error:
-            st.error(f"❌ {calc_error}")
-        else:
-            st.success("✅ محاسبات با موفقیت انجام شد.")
-            
-            if use_leverage:
-                c1, c2, c3, c4 = st.columns(4)
-                c1.metric("سرمایه", f"${capital:,.0f}")
-                c2.metric("حد ضرر", f"{stop_loss_percentage:.2f}%")
-                c3.metric("اهرم", f"{leverage:.0f}×")
-                c4.metric("تعداد سطوح", len(risk_levels))
-            else:
-                c1, c2, c3 = st.columns(3)
-                c1.metric("سرمایه", f"${capital:,.0f}")
-                c2.metric("حد ضرر", f"{stop_loss_percentage:.2f}%")
-                c3.metric("تعداد سطوح", len(risk_levels))
-
-            st.divider()
-            
-            st.subheader("📊 جدول سایز پوزیشن")
-            
-            st.dataframe(
-                table_df.style.format("${:,.2f}"), 
-                use_container_width=True
-            )
-            
-            st.info("💡 **ردیف اول (میزان ریسک دلاری):** این مقدار نشان‌دهنده **حداکثر مبلغی** است که شما مجازید در این معامله، در صورت رسیدن به حد ضرر، از دست بدهید.")
-            
-            if use_leverage:
-                st.info("📊 **ردیف دوم (سایز پوزیشن):** ارزش کل معامله‌ای که باید باز کنید.")
-                st.info(f"💳 **ردیف سوم (مارجین لازم با اهرم {leverage:.0f}×):** با استفاده از اهرم {leverage:.0f}×، فقط کافیه این مقدار (سایز پوزیشن ÷ {leverage:.0f}) از سرمایه‌ات رو وارد کنی!")
-            else:
-                st.info("🚀 **ردیف دوم (سایز پوزیشن):** این مقدار نشان‌دهنده **ارزش کل دلاری** است که باید با آن وارد معامله شوید تا در صورت فعال شدن حد ضرر، دقیقا مبلغ ردیف اول را از دست بدهید.")
-            
-            st.caption("💡 این محاسبات بر اساس فرمول‌های استاندارد مدیریت ریسک در بازارهای مالی انجام شده‌اند.")
+    if calc_error:
+        st.error(f"❌ {calc_error}")
+        return
+
+    render_results({
+        "capital": capital,
+        "stop_loss_percentage": stop_loss_percentage,
+        "leverage": leverage,
+        "use_leverage": use_leverage,
+        "risk_levels": risk_levels,
+        "table_df": table_df,
+    }, table_view)
+
+    if use_leverage:
+        render_liquidation(capital, stop_loss_percentage, risk_levels, leverage)
+
+    render_heatmap_sweep(capital, leverage)
+    render_leverage_sweep(capital, stop_loss_percentage, risk_levels)
+    render_monte_carlo(risk_levels)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,178 @@
+"""Benchmarks for the sizing core.
+
+Times parse_risk_levels, validate_inputs and every sizing engine from 1 to
+1,000,000 risk levels and exits non-zero when a case is slower than this
+machine's baseline by more than the threshold. Baselines are committed in
+benchmarks/baselines.json, one per machine; a machine without one fails
+until --save-baseline records it. Every run is also appended to a local,
+untracked history file.
+
+    python benchmarks/bench_sizing.py                  # compare with baseline
+    python benchmarks/bench_sizing.py --save-baseline  # record this machine's baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from trade_size import (
+    calculate_position_sizes,
+    calculate_position_sizes_decimal,
+    calculate_position_sizes_fixed,
+    create_risk_management_table,
+    parse_risk_levels,
+    validate_inputs,
+)
+from trade_size.parsing import MAX_INPUT_LENGTH
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINES = os.path.join(BENCHMARK_DIR, "baselines.json")
+DEFAULT_HISTORY = os.path.join(BENCHMARK_DIR, "history.json")
+SIZES = [1, 10, 100, 1_000, 10_000, 100_000, 1_000_000]
+CAPITAL, STOP_LOSS, LEVERAGE = 25_000.0, 1.5, 10.0
+
+def float_loop(capital, stop_loss_percentage, risk_levels, leverage):
+    dollar_risks, position_sizes, margins = [], [], []
+    for risk_percent in risk_levels:
+        dollar_risk = capital * risk_percent / 100.0
+        position_size = capital * risk_percent / stop_loss_percentage
+        dollar_risks.append(dollar_risk)
+        position_sizes.append(position_size)
+        margins.append(position_size / leverage)
+    return dollar_risks, position_sizes, margins
+
+def build_cases(n):
+    risk_array = np.round(np.linspace(0.01, 99.0, n), 6)
+    risk_list = risk_array.tolist()
+    step = 98.99 / max(n - 1, 1)
+
+    cases = {
+        "validate_inputs": lambda: validate_inputs(CAPITAL, STOP_LOSS, risk_list, LEVERAGE),
+        "parse_range": lambda: parse_risk_levels(f"0.01:99:{step!r}"),
+        "engine_float_loop": lambda: float_loop(CAPITAL, STOP_LOSS, risk_list, LEVERAGE),
+        "engine_decimal": lambda: calculate_position_sizes_decimal(CAPITAL, STOP_LOSS, risk_list, LEVERAGE),
+        "engine_fixed": lambda: calculate_position_sizes_fixed(CAPITAL, STOP_LOSS, risk_list, LEVERAGE),
+        "engine_vectorized": lambda: calculate_position_sizes(CAPITAL, STOP_LOSS, risk_array, LEVERAGE),
+        "create_risk_management_table": lambda: create_risk_management_table(CAPITAL, STOP_LOSS, risk_list, LEVERAGE),
+    }
+
+    plain_input = ", ".join(map(repr, risk_list))
+    if len(plain_input) <= MAX_INPUT_LENGTH:
+        cases["parse_plain"] = lambda: parse_risk_levels(plain_input)
+    return cases
+
+def measure(function, repeat, min_time):
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10
+    best = min([elapsed] + timer.repeat(repeat=repeat - 1, number=number)) if repeat > 1 else elapsed
+    return best / number
+
+def run(sizes, repeat, min_time, only):
+    results = {}
+    for n in sizes:
+        for name, function in build_cases(n).items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            seconds = measure(function, repeat, min_time)
+            results[f"{name}/{n}"] = seconds
+            print(f"{name:<30} {n:>9,}  {seconds * 1e6:>14,.2f} µs", flush=True)
+    return results
+
+def cpu_model():
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or "unknown cpu"
+
+# Timings are only comparable on the same hardware and interpreter.
+def machine_key():
+    python = ".".join(platform.python_version_tuple()[:2])
+    return f"{platform.system()} {platform.machine()} / {cpu_model()} x{os.cpu_count()} / Python {python}"
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+def save_json(path, data):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for key, seconds in sorted(results.items()):
+        previous = baseline["results"].get(key)
+        if previous and seconds > previous * (1 + threshold):
+            regressions.append((key, previous, seconds))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baselines", default=DEFAULT_BASELINES)
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--max-levels", type=int, default=SIZES[-1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per timing sample")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--only", nargs="*", help="substrings of case names to run")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    sizes = [n for n in SIZES if n <= args.max_levels]
+    started = time.perf_counter()
+    results = run(sizes, args.repeat, args.min_time, args.only)
+
+    machine = machine_key()
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": machine,
+        "results": results,
+    }
+    history = load_json(args.history, [])
+    history.append(entry)
+    save_json(args.history, history)
+    print(f"\n{len(results)} cases in {time.perf_counter() - started:.1f}s, saved to {args.history}")
+
+    baselines = load_json(args.baselines, {})
+    if args.save_baseline:
+        baselines[machine] = entry
+        save_json(args.baselines, baselines)
+        print(f"recorded as the baseline for {machine} in {args.baselines}")
+        return 0
+
+    baseline = baselines.get(machine)
+    if baseline is None:
+        print(f"NO BASELINE for {machine} in {args.baselines}; run with --save-baseline and commit it")
+        return 2
+
+    regressions = compare(results, baseline, args.threshold)
+    for key, previous, seconds in regressions:
+        print(f"REGRESSION {key}: {previous * 1e6:,.2f} µs -> {seconds * 1e6:,.2f} µs ({seconds / previous - 1:+.0%})")
+    if regressions:
+        return 1
+    print(f"no regressions beyond {args.threshold:.0%} against baseline from {baseline['timestamp']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
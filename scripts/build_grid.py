@@ -0,0 +1,21 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trade_size.grid import DEFAULT_GRID_PATH, STANDARD_RISK_LEVELS, build_grid
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="ساخت جدول پیش‌محاسبه سایز پوزیشن (حد ضرر × سطح ریسک) به‌صورت فایل باینری قابل memory-map."
+    )
+    parser.add_argument("path", nargs="?", default=DEFAULT_GRID_PATH)
+    parser.add_argument("--risk-levels", type=float, nargs="+", default=list(STANDARD_RISK_LEVELS))
+    args = parser.parse_args()
+
+    build_grid(args.path, args.risk_levels)
+    print(f"✅ جدول در {args.path} ساخته شد ({os.path.getsize(args.path):,} بایت).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Build the static assets served from ./static.
+
+    python scripts/build_static.py                        # minify static/app.css
+    python scripts/build_static.py --font Vazirmatn[wght].ttf
+
+--font subsets a Vazirmatn TTF (the variable font from
+https://github.com/rastikerdar/vazirmatn/releases) to the Latin and
+Persian glyphs the UI uses and writes static/fonts/Vazirmatn-subset.woff2.
+Subsetting needs `pip install fonttools brotli`.
+"""
+import argparse
+import ast
+import os
+import re
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSS_SOURCE = os.path.join(ROOT, "static", "app.css")
+CSS_OUTPUT = os.path.join(ROOT, "static", "app.min.css")
+FONT_OUTPUT = os.path.join(ROOT, "static", "fonts", "Vazirmatn-subset.woff2")
+UI_SOURCES = [os.path.join(ROOT, "app.py")]
+
+UNICODE_RANGES = [
+    (0x0020, 0x007E),  # Basic Latin
+    (0x00A0, 0x00FF),  # Latin-1 punctuation, ×, ÷
+    (0x060C, 0x060C),  # Arabic comma
+    (0x061B, 0x061F),  # Arabic semicolon, question mark
+    (0x0621, 0x064A),  # Arabic letters
+    (0x064B, 0x0655),  # Harakat
+    (0x0660, 0x066C),  # Arabic-Indic digits, ٪, decimal/thousands separators
+    (0x067E, 0x067E),  # پ
+    (0x0686, 0x0686),  # چ
+    (0x0698, 0x0698),  # ژ
+    (0x06A9, 0x06A9),  # ک
+    (0x06AF, 0x06AF),  # گ
+    (0x06CC, 0x06CC),  # ی
+    (0x06F0, 0x06F9),  # Persian digits
+    (0x200C, 0x200F),  # ZWNJ, ZWJ, direction marks
+    (0x2010, 0x2027),  # General punctuation (dashes, quotes, ellipsis)
+    (0x2212, 0x2212),  # Minus sign
+]
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    css = css.replace(";}", "}")
+    return css.strip() + "\n"
+
+def ui_characters():
+    characters = set()
+    for path in UI_SOURCES:
+        with open(path, encoding="utf-8") as handle:
+            tree = ast.parse(handle.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                characters.update(node.value)
+    return characters
+
+def subset_font(source: str) -> None:
+    from fontTools import subset
+
+    unicodes = {code for start, end in UNICODE_RANGES for code in range(start, end + 1)}
+    unicodes.update(ord(character) for character in ui_characters())
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+
+    font = subset.load_font(source, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=unicodes)
+    subsetter.subset(font)
+
+    os.makedirs(os.path.dirname(FONT_OUTPUT), exist_ok=True)
+    subset.save_font(font, FONT_OUTPUT, options)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--font", help="path to a Vazirmatn .ttf to subset")
+    args = parser.parse_args()
+
+    with open(CSS_SOURCE, encoding="utf-8") as handle:
+        source = handle.read()
+    minified = minify_css(source)
+    with open(CSS_OUTPUT, "w", encoding="utf-8") as handle:
+        handle.write(minified)
+    print(f"{CSS_OUTPUT}: {len(source.encode())} -> {len(minified.encode())} bytes")
+
+    if args.font:
+        subset_font(args.font)
+        print(f"{FONT_OUTPUT}: {os.path.getsize(args.font)} -> {os.path.getsize(FONT_OUTPUT)} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+
+def build_body(batch_size: int, levels: int, ndjson: bool) -> bytes:
+    requests = [
+        {
+            "capital": round(random.uniform(100, 100_000), 2),
+            "stop_loss_percentage": round(random.uniform(0.1, 10), 2),
+            "risk_levels": [round(random.uniform(0.1, 5), 2) for _ in range(levels)],
+            "leverage": random.randint(1, 125),
+        }
+        for _ in range(batch_size)
+    ]
+    if ndjson:
+        return "".join(json.dumps(request) + "\n" for request in requests).encode()
+    return json.dumps(requests).encode()
+
+def worker(args, deadline, latencies, lock, counters):
+    body = build_body(args.batch_size, args.levels, args.ndjson)
+    content_type = "application/x-ndjson" if args.ndjson else "application/json"
+    connection = http.client.HTTPConnection(args.host, args.port)
+    local_latencies = []
+    errors = 0
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        connection.request("POST", "/v1/size", body=body, headers={"Content-Type": content_type})
+        response = connection.getresponse()
+        response.read()
+        local_latencies.append(time.perf_counter() - started)
+        if response.status != 200:
+            errors += 1
+
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        counters["errors"] += errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the trade_size HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=100, help="sizing requests per HTTP call")
+    parser.add_argument("--levels", type=int, default=4, help="risk levels per sizing request")
+    parser.add_argument("--ndjson", action="store_true")
+    args = parser.parse_args()
+
+    latencies, lock, counters = [], threading.Lock(), {"errors": 0}
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(args, deadline, latencies, lock, counters))
+        for _ in range(args.connections)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print("no requests completed")
+        return
+
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    calls = len(latencies)
+    print(f"HTTP calls:         {calls} ({calls / elapsed:,.0f}/s, {counters['errors']} errors)")
+    print(f"sizing requests/s:  {calls * args.batch_size / elapsed:,.0f}")
+    print(f"latency p50/p99 ms: {cuts[49] * 1000:.2f} / {cuts[98] * 1000:.2f}")
+
+if __name__ == "__main__":
+    main()
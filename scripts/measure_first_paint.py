@@ -0,0 +1,57 @@
+"""Measure first paint / first contentful paint of the running app.
+
+    streamlit run app.py &
+    python scripts/measure_first_paint.py --url http://localhost:8501 --runs 10
+
+Needs `pip install playwright && playwright install chromium`. Each run uses
+a fresh browser context (cold cache) and reports the browser's own paint
+timings, so numbers from before and after a change are comparable.
+"""
+import argparse
+import statistics
+
+PAINT_TIMINGS_JS = """
+() => Object.fromEntries(
+    performance.getEntriesByType("paint").map(entry => [entry.name, entry.startTime])
+)
+"""
+
+def measure(url: str, runs: int, offline_cdn: bool):
+    from playwright.sync_api import sync_playwright
+
+    samples = {"first-paint": [], "first-contentful-paint": [], "fonts-ready": []}
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        for _ in range(runs):
+            context = browser.new_context()
+            page = context.new_page()
+            if offline_cdn:
+                # Simulates an air-gapped box: third-party hosts never answer.
+                page.route("**/*", lambda route: route.abort()
+                           if "localhost" not in route.request.url and "127.0.0.1" not in route.request.url
+                           else route.continue_())
+            page.goto(url, wait_until="load")
+            page.wait_for_selector("h1")
+            fonts_ready = page.evaluate("async () => { await document.fonts.ready; return performance.now(); }")
+            timings = page.evaluate(PAINT_TIMINGS_JS)
+            for name in ("first-paint", "first-contentful-paint"):
+                if name in timings:
+                    samples[name].append(timings[name])
+            samples["fonts-ready"].append(fonts_ready)
+            context.close()
+        browser.close()
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8501")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--offline-cdn", action="store_true", help="block every non-local request")
+    args = parser.parse_args()
+
+    for name, values in measure(args.url, args.runs, args.offline_cdn).items():
+        if values:
+            print(f"{name:<24} median {statistics.median(values):8.1f} ms   max {max(values):8.1f} ms")
+
+if __name__ == "__main__":
+    main()
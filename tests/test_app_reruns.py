@@ -0,0 +1,93 @@
+import functools
+import os
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+from trade_size.profiling import PROFILE_ENV_VAR
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# AppTest always requests a full rerun. A browser interacting with a widget
+# inside a fragment instead sends a rerun scoped to that fragment's id;
+# fragment_rerun sends the same request through Streamlit's own runner.
+def registered_fragments(app_test):
+    return list(app_test._fragment_storage._fragments)
+
+def fragment_rerun(app_test):
+    rerun_data = functools.partial(RerunData, fragment_id_queue=registered_fragments(app_test))
+    with mock.patch.object(local_script_runner, "RerunData", rerun_data):
+        app_test.run()
+
+@pytest.fixture
+def app_test(monkeypatch):
+    monkeypatch.setenv(PROFILE_ENV_VAR, "1")
+    return AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=60)
+
+def stage_counts(app_test):
+    return app_test.session_state["profiler"].last_counts
+
+def test_full_run_executes_every_stage_once(app_test):
+    app_test.run()
+
+    assert not app_test.exception
+    counts = stage_counts(app_test)
+    assert counts["inject_css"] == 1
+    assert counts["calculator"] == 1
+    assert counts["parse"] == 1
+    assert counts["compute"] == 1
+
+@pytest.mark.parametrize("change", [
+    lambda at: at.number_input(key="stop_loss_percentage").set_value(2.5),
+    lambda at: at.text_input(key="risk_inputs").set_value("0.5, 1, 3"),
+    lambda at: at.checkbox[0].check(),
+])
+def test_input_change_reruns_only_the_calculator(app_test, change):
+    app_test.run()
+    runs = app_test.session_state["profiler"].runs
+
+    change(app_test)
+    fragment_rerun(app_test)
+
+    assert not app_test.exception
+    counts = stage_counts(app_test)
+    assert app_test.session_state["profiler"].runs == runs + 1
+    assert counts.get("inject_css", 0) == 0
+    assert counts["calculator"] == 1
+    assert counts["parse"] == 1
+    assert counts["compute"] == 1
+
+def test_calculator_is_the_only_registered_fragment(app_test):
+    app_test.run()
+
+    # Without st.fragment nothing is registered and every input change
+    # would rerun the whole script, CSS injection included.
+    assert len(registered_fragments(app_test)) == 1
+    fragment_rerun(app_test)
+    assert set(stage_counts(app_test)) >= {"calculator"}
+    assert "inject_css" not in stage_counts(app_test)
+
+def test_panels_refresh_on_fragment_reruns(app_test):
+    app_test.run()
+    app_test.text_input(key="risk_inputs").set_value("0.5, 1, 3")
+    fragment_rerun(app_test)
+
+    captions = [caption.value for caption in app_test.caption]
+    runs = app_test.session_state["profiler"].runs
+    assert f"تعداد اجرا: {runs}" in captions
+    assert any(caption.startswith("اندازه: ") for caption in captions)
+
+def test_css_makes_no_third_party_requests(app_test):
+    import app
+
+    app_test.run()
+
+    styles = [element.value for element in app_test.markdown if "<style>" in element.value]
+    assert len(styles) == 1
+    assert "@import" not in styles[0]
+    assert "https://" not in styles[0]
+    assert ("rel=\"preload\"" in styles[0]) == os.path.exists(os.path.join(app.STATIC_DIR, app.FONT_FILE))
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def results_table(at):
+    return at.dataframe[0].value
+
+@pytest.fixture
+def app_test():
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=60)
+    at.run()
+    return at
+
+def choose_view(at, view):
+    table_view = next(radio for radio in at.radio if radio.label == "نمایش جدول")
+    table_view.set_value(view).run()
+
+def test_column_view_of_a_long_ladder_sends_only_one_page(app_test):
+    import app
+
+    app_test.text_input(key="risk_inputs").set_value("0.01:99:0.01").run()
+    choose_view(app_test, app.TABLE_VIEWS[1])
+
+    assert not app_test.exception
+    # One default page of rows, one column per result metric.
+    assert results_table(app_test).shape == (app.PAGE_SIZES[1], 2)
+    assert any("نمای ستونی" in info.value for info in app_test.info)
+
+def test_column_view_of_a_short_ladder_stays_wide(app_test):
+    import app
+
+    app_test.text_input(key="risk_inputs").set_value("0.5, 1, 2").run()
+    choose_view(app_test, app.TABLE_VIEWS[1])
+
+    assert list(results_table(app_test).columns) == ["0.5%", "1.0%", "2.0%"]
+    assert not any("نمای ستونی" in info.value for info in app_test.info)
@@ -0,0 +1,116 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trade_size.atr import ATRState, add_atr_stops
+from trade_size.cli import main
+
+def random_bars(count, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, count)))
+    spread = close * rng.uniform(0.001, 0.02, count)
+    high = close + spread * rng.uniform(0.0, 1.0, count)
+    low = high - spread
+    return high, low, close
+
+def per_bar(state, high, low, close):
+    return np.array([np.nan if value is None else value for value in map(state.update, high, low, close)])
+
+@pytest.mark.parametrize("period", [1, 3, 14, 200])
+def test_update_many_matches_per_bar_updates(period):
+    high, low, close = random_bars(5_000)
+
+    expected = per_bar(ATRState(period), high, low, close)
+    actual = ATRState(period).update_many(high, low, close)
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, equal_nan=True)
+
+@pytest.mark.parametrize("split", [0, 5, 13, 14, 15, 2_500])
+def test_split_runs_resume_through_to_dict(split):
+    high, low, close = random_bars(5_000, seed=1)
+    expected = ATRState(14).update_many(high, low, close)
+
+    first = ATRState(14)
+    head = first.update_many(high[:split], low[:split], close[:split])
+    resumed = ATRState.from_dict(json.loads(json.dumps(first.to_dict())))
+    tail = resumed.update_many(high[split:], low[split:], close[split:])
+
+    np.testing.assert_allclose(np.concatenate((head, tail)), expected, rtol=1e-9, equal_nan=True)
+
+def test_bars_with_missing_prices_are_skipped():
+    high = np.array([10.0, 11.0, 12.0, 13.0, np.nan, 15.0, 16.0, 17.0])
+    low = high - 1.0
+    close = high - 0.5
+    low[6] = np.inf
+
+    state = ATRState(3)
+    atr = state.update_many(high, low, close)
+
+    valid = np.isfinite(high) & np.isfinite(low)
+    expected = ATRState(3).update_many(high[valid], low[valid], close[valid])
+    assert np.isnan(atr[[4, 6]]).all()
+    np.testing.assert_allclose(atr[valid], expected)
+    assert state.is_finite()
+    assert state.count == 6
+    assert state.previous_close == close[7]
+
+    scalar = ATRState(3)
+    per_bar(scalar, high[:4], low[:4], close[:4])
+    before = scalar.to_dict()
+    assert math.isnan(scalar.update(float("nan"), 9.0, 9.5))
+    assert scalar.to_dict() == before
+
+def test_non_finite_state_is_not_loaded():
+    data = ATRState(14).to_dict()
+    data["atr"] = float("nan")
+    with pytest.raises(ValueError):
+        ATRState.from_dict(data)
+
+def test_a_blank_cell_does_not_poison_the_saved_state(tmp_path):
+    high, low, close = random_bars(40)
+    frame = pd.DataFrame({"capital": 1000, "risk_percentage": 1, "high": high, "low": low, "close": close})
+    frame.loc[20, "high"] = None
+    frame.to_csv(tmp_path / "bars.csv", index=False)
+    state_path = tmp_path / "atr.json"
+
+    status = main([str(tmp_path / "bars.csv"), str(tmp_path / "sized.csv"), "--atr-period", "5", "--atr-state", str(state_path)])
+
+    assert status == 0
+    state = json.loads(state_path.read_text())
+    assert math.isfinite(state["atr"])
+    assert len(pd.read_csv(tmp_path / "sized.csv")) == 40 - 4 - 1
+
+def test_multi_symbol_input_is_refused(tmp_path):
+    high, low, close = random_bars(10)
+    frame = pd.DataFrame({
+        "symbol": ["BTC"] * 5 + ["ETH"] * 5,
+        "capital": 1000, "risk_percentage": 1, "high": high, "low": low, "close": close,
+    })
+    frame.to_csv(tmp_path / "watchlist.csv", index=False)
+    state_path = tmp_path / "atr.json"
+
+    status = main([str(tmp_path / "watchlist.csv"), str(tmp_path / "sized.csv"), "--atr-period", "3", "--atr-state", str(state_path)])
+
+    assert status == 2
+    assert not state_path.exists()
+
+def test_state_remembers_its_symbol(tmp_path):
+    high, low, close = random_bars(10)
+    frame = pd.DataFrame({"symbol": "BTC", "capital": 1000, "risk_percentage": 1, "high": high, "low": low, "close": close})
+    frame.to_csv(tmp_path / "btc.csv", index=False)
+    frame.assign(symbol="ETH").to_csv(tmp_path / "eth.csv", index=False)
+    state_path = tmp_path / "atr.json"
+    args = ["--atr-period", "3", "--atr-state", str(state_path)]
+
+    assert main([str(tmp_path / "btc.csv"), str(tmp_path / "out.csv")] + args) == 0
+    assert json.loads(state_path.read_text())["symbol"] == "BTC"
+    assert main([str(tmp_path / "eth.csv"), str(tmp_path / "out.csv")] + args) == 2
+
+def test_add_atr_stops_leaves_unseeded_bars_empty():
+    high, low, close = random_bars(20)
+    frame = add_atr_stops(pd.DataFrame({"high": high, "low": low, "close": close}), ATRState(5), multiplier=2.0)
+    stops = frame["stop_loss_percentage"].to_numpy()
+    assert np.isnan(stops[:4]).all() and np.isfinite(stops[4:]).all()
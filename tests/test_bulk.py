@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from trade_size.cli import main
+
+pytest.importorskip("pyarrow")
+
+MIXED_ROWS = (
+    ["1000,1.5,1,10,A"] * 5
+    + ["1000,1.5,1,2.5,B", "1000,1.5,1,,C", "abc,1.5,1,3,D", "2000,2,0.5,1,E", "1000,-1,1,1,F"]
+)
+
+@pytest.fixture
+def mixed_csv(tmp_path):
+    path = tmp_path / "watchlist.csv"
+    path.write_text("capital,stop_loss_percentage,risk_percentage,leverage,symbol\n" + "\n".join(MIXED_ROWS) + "\n")
+    return path
+
+def test_parquet_output_survives_dtype_changes_between_chunks(mixed_csv, tmp_path):
+    output = tmp_path / "sized.parquet"
+    rejects = tmp_path / "rejects.parquet"
+
+    # The first chunk reads leverage as int64, later ones as float64/object.
+    status = main([str(mixed_csv), str(output), "--rejects", str(rejects), "--chunk-size", "5"])
+
+    assert status == 0
+    accepted = pd.read_parquet(output)
+    rejected = pd.read_parquet(rejects)
+    assert list(accepted["symbol"]) == ["A"] * 5 + ["B", "E"]
+    assert accepted["leverage"].tolist() == [10.0] * 5 + [2.5, 1.0]
+    assert accepted["margin_required"].iloc[5] == pytest.approx(1000 * 1 / 1.5 / 2.5)
+    assert list(rejected["symbol"]) == ["C", "D", "F"]
+    assert rejected["capital"].iloc[1] == "abc"
+
+def test_csv_output_matches_parquet_output(mixed_csv, tmp_path):
+    main([str(mixed_csv), str(tmp_path / "sized.csv"), "--chunk-size", "3"])
+    main([str(mixed_csv), str(tmp_path / "sized.parquet"), "--chunk-size", "3"])
+
+    from_csv = pd.read_csv(tmp_path / "sized.csv")
+    from_parquet = pd.read_parquet(tmp_path / "sized.parquet")
+    pd.testing.assert_frame_equal(from_csv, from_parquet, check_dtype=False)
+
+def test_non_finite_and_overflowing_rows_are_rejected(tmp_path):
+    from trade_size.validation import NOT_A_NUMBER_ERROR
+
+    source = tmp_path / "watchlist.csv"
+    source.write_text(
+        "capital,stop_loss_percentage,risk_percentage,symbol\n"
+        "1000,1.5,1,A\ninf,1.5,1,B\n1e400,1.5,1,C\n1e306,0.01,99,D\n"
+    )
+    output = tmp_path / "sized.csv"
+    rejects = tmp_path / "rejects.csv"
+
+    assert main([str(source), str(output), "--rejects", str(rejects)]) == 0
+
+    accepted = pd.read_csv(output)
+    rejected = pd.read_csv(rejects)
+    assert list(accepted["symbol"]) == ["A"]
+    assert list(rejected["symbol"]) == ["B", "C", "D"]
+    assert set(rejected["error"]) == {NOT_A_NUMBER_ERROR}
@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+
+from trade_size.cache import LRUCache, cached_risk_management_table, table_cache_key, table_nbytes
+
+def test_cache_is_bounded_by_bytes():
+    cache = LRUCache(maxsize=100, max_bytes=1000, sizeof=len)
+    for key in range(5):
+        cache.set(key, b"x" * 300)
+
+    assert len(cache) == 3
+    assert cache.nbytes == 900
+    assert cache.get(0) is None and cache.get(4) is not None
+    assert cache.stats()["evictions"] == 2
+
+def test_values_larger_than_the_budget_are_not_stored():
+    cache = LRUCache(max_bytes=1000, sizeof=len)
+    cache.set("small", b"x" * 10)
+    cache.set("huge", b"x" * 5000)
+
+    assert cache.get("huge") is None
+    assert cache.get("small") is not None
+    assert cache.stats()["skipped"] == 1
+    assert cache.nbytes == 10
+
+def test_replacing_a_key_does_not_double_count():
+    cache = LRUCache(max_bytes=1000, sizeof=len)
+    cache.set("key", b"x" * 400)
+    cache.set("key", b"x" * 500)
+    assert cache.nbytes == 500
+
+def test_nearby_inputs_do_not_share_frames():
+    cache = LRUCache(max_bytes=10 ** 7, sizeof=table_nbytes)
+    first, _ = cached_risk_management_table(1000, 1.5, [1.0], cache=cache)
+    second, _ = cached_risk_management_table(1000, 1.5, [1.0 + 1e-11], cache=cache)
+
+    assert list(first.columns) == ["1.0%"]
+    assert list(second.columns) == [f"{1.0 + 1e-11}%"]
+    assert cache.stats()["hits"] == 0
+
+def test_key_of_a_large_ladder_is_compact():
+    key = table_cache_key(1000, 1.5, np.arange(1, 1_000_001) / 10_001, 1.0)
+    assert len(key) == 5
+    assert key == table_cache_key(1000, 1.5, list(np.arange(1, 1_000_001) / 10_001), 1.0)
+
+def test_sizing_a_wide_table_is_cheap():
+    table, _ = cached_risk_management_table(1000, 1.5, np.arange(1, 200_001) / 2_001, cache=LRUCache(maxsize=1))
+
+    start = time.perf_counter()
+    nbytes = table_nbytes(table)
+    elapsed = time.perf_counter() - start
+
+    assert nbytes >= table.size * 8
+    assert elapsed < 0.01
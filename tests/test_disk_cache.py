@@ -0,0 +1,119 @@
+import multiprocessing
+import pickle
+
+import pytest
+
+import trade_size.disk_cache
+from trade_size.disk_cache import DiskCache, disk_memoize, stable_key
+
+VALUE = b"x" * 1000
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(trade_size.disk_cache.time, "time", clock)
+    return clock
+
+def blob_size(value):
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+def test_eviction_drops_the_least_recently_read_entries(tmp_path, clock):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_bytes=3 * blob_size(VALUE))
+    for key in "abc":
+        cache.set(key, VALUE)
+        clock.now += 1.0
+
+    clock.now += trade_size.disk_cache.ACCESS_RESOLUTION_SECONDS + 1.0
+    assert cache.get("a") == VALUE
+    cache.set("d", VALUE)
+
+    assert [cache.get(key) is not None for key in "abcd"] == [True, False, True, True]
+
+def test_reads_within_the_access_resolution_do_not_refresh_entries(tmp_path, clock):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_bytes=2 * blob_size(VALUE))
+    cache.set("a", VALUE)
+    clock.now += 1.0
+    cache.set("b", VALUE)
+
+    clock.now += 1.0
+    cache.get("a")
+    cache.set("c", VALUE)
+
+    assert cache.get("a") is None and cache.get("b") == VALUE
+
+def test_total_size_stays_under_the_byte_cap(tmp_path, clock):
+    max_bytes = 5 * blob_size(VALUE) + 100
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_bytes=max_bytes)
+    for index in range(50):
+        cache.set(str(index), VALUE)
+        clock.now += 1.0
+
+    stats = cache.stats()
+    assert stats["entries"] == 5
+    assert stats["bytes"] <= max_bytes
+
+def test_values_larger_than_the_cap_are_not_stored(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_bytes=2 * blob_size(VALUE))
+    cache.set("small", VALUE)
+
+    cache.set("large", VALUE * 3)
+
+    assert cache.get("large") is None
+    assert cache.get("small") == VALUE
+
+def test_engine_version_is_part_of_the_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(trade_size.disk_cache, "_default_cache", DiskCache(str(tmp_path / "cache.sqlite3")))
+    calls = []
+
+    @disk_memoize("sizing")
+    def size(capital):
+        calls.append(capital)
+        return capital * 2
+
+    key = stable_key("sizing", 100)
+    assert size(100) == 200 and size(100) == 200
+    monkeypatch.setattr(trade_size.disk_cache, "ENGINE_VERSION", "next")
+    assert stable_key("sizing", 100) != key
+    assert size(100) == 200
+    assert calls == [100, 100]
+
+def test_disk_memoize_uses_the_shared_cache_at_call_time(tmp_path, monkeypatch):
+    @disk_memoize("sizing", ignore=("workers",))
+    def size(capital, workers=1):
+        return capital * 2
+
+    first = DiskCache(str(tmp_path / "first.sqlite3"))
+    monkeypatch.setattr(trade_size.disk_cache, "_default_cache", first)
+    size(100, workers=4)
+
+    assert first.get(stable_key("sizing", 100)) == 200
+
+def fill(path, prefix, count):
+    cache = DiskCache(path)
+    for index in range(count):
+        cache.set(f"{prefix}{index}", (prefix, index))
+        cache.set("shared", prefix)
+        assert cache.get(f"{prefix}{index}") == (prefix, index)
+
+def test_two_processes_can_share_one_cache_file(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    DiskCache(path)
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=fill, args=(path, prefix, 200)) for prefix in "ab"]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+
+    assert [worker.exitcode for worker in workers] == [0, 0]
+    cache = DiskCache(path)
+    assert cache.stats()["entries"] == 401
+    assert cache.get("a199") == ("a", 199) and cache.get("b199") == ("b", 199)
+    assert cache.get("shared") in ("a", "b")
@@ -0,0 +1,25 @@
+import numpy as np
+
+from trade_size.engine import VECTOR_RTOL, calculate_position_sizes, calculate_position_sizes_decimal
+
+def log_uniform(rng, low, high, size):
+    return np.exp(rng.uniform(np.log(low), np.log(high), size))
+
+def test_vector_engine_stays_within_rtol_of_decimal():
+    rng = np.random.default_rng(20_240_601)
+    count = 2_000
+    capital = log_uniform(rng, 1.0, 1e12, count)
+    stop_loss = log_uniform(rng, 0.01, 100.0, count)
+    leverage = log_uniform(rng, 1.0, 125.0, count)
+    risk = log_uniform(rng, 0.01, 100.0, (count, 5))
+    # Typed inputs are short decimals, which is what the Decimal path sees.
+    capital[::2] = capital[::2].round(2)
+    stop_loss[::2] = stop_loss[::2].round(2)
+    risk[::2] = risk[::2].round(2)
+
+    vector = calculate_position_sizes(capital[:, None], stop_loss[:, None], risk, leverage[:, None])
+
+    for row in range(count):
+        exact = calculate_position_sizes_decimal(capital[row], stop_loss[row], risk[row].tolist(), leverage[row])
+        for actual, expected in zip(vector, exact):
+            np.testing.assert_allclose(actual[row], expected, rtol=VECTOR_RTOL, atol=0)
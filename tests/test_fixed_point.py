@@ -0,0 +1,86 @@
+from decimal import Decimal, localcontext
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from trade_size import (
+    FIXED_POINT_ROUNDING_MODES,
+    FIXED_POINT_SCALE,
+    calculate_position_sizes_decimal,
+    calculate_position_sizes_fixed,
+    from_fixed_point,
+)
+from trade_size.fixed_point import _divide_rounded
+
+CASES = [
+    (1000.0, 1.5, 1.0),
+    (12345.67, 0.07, 10.0),
+    (1 / 3, 2 / 3, 3.3),
+    (1e12, 1e-5, 125.0),
+    (500_000.0, 0.5, 20.0),
+]
+
+RISK_LEVELS = [1 / 3, 0.1, 2 / 7, 1e-7, 1e-12, 1e-20, 0.25, 99.99, 123.456789012345, 1.25e-5]
+
+def exact_units(capital, stop_loss_percentage, risk_levels, leverage, rounding):
+    capital, stop_loss, leverage = (Fraction(str(value)) for value in (capital, stop_loss_percentage, leverage))
+    results = ([], [], [])
+    for risk_percent in risk_levels:
+        risk = Fraction(str(float(risk_percent)))
+        position_size = capital * risk / stop_loss
+        for column, value in zip(results, (capital * risk / 100, position_size, position_size / leverage)):
+            units = value * FIXED_POINT_SCALE
+            column.append(_divide_rounded(units.numerator, units.denominator, rounding))
+    return results
+
+def random_risk_levels(seed):
+    rng = np.random.default_rng(seed)
+    return list(np.round(rng.uniform(0.01, 100, 300), 2)) + list(rng.uniform(0.01, 100, 300))
+
+@pytest.mark.parametrize("rounding", FIXED_POINT_ROUNDING_MODES)
+@pytest.mark.parametrize("capital, stop_loss_percentage, leverage", CASES)
+def test_fixed_point_is_exact_rational_rounded_once(capital, stop_loss_percentage, leverage, rounding):
+    risk_levels = RISK_LEVELS + random_risk_levels(0)
+    result = calculate_position_sizes_fixed(capital, stop_loss_percentage, risk_levels, leverage, rounding)
+    assert tuple(result) == exact_units(capital, stop_loss_percentage, risk_levels, leverage, rounding)
+
+@pytest.mark.parametrize("capital, stop_loss_percentage, leverage", CASES)
+def test_fixed_point_matches_decimal_path(capital, stop_loss_percentage, leverage):
+    risk_levels = RISK_LEVELS + random_risk_levels(1)
+    fixed = calculate_position_sizes_fixed(capital, stop_loss_percentage, risk_levels, leverage)
+    with localcontext() as context:
+        context.prec = 60
+        reference = calculate_position_sizes_decimal(capital, stop_loss_percentage, risk_levels, leverage)
+
+    half_unit = Decimal(1) / (2 * FIXED_POINT_SCALE)
+    for fixed_column, reference_column in zip(fixed, reference):
+        for units, value in zip(fixed_column, reference_column):
+            value = Decimal(value)
+            assert abs(from_fixed_point(units) - value) <= half_unit + abs(value) * Decimal("1e-15")
+
+def test_inputs_are_read_as_their_decimal_repr():
+    dollar_risk, position_size, _ = calculate_position_sizes_fixed(1000, 1.5, [1 / 3])
+    # 1000 * 0.3333333333333333% = 3.333333333333333 USD
+    assert dollar_risk == [333333333]
+    assert position_size == [22222222222]
+
+@pytest.mark.parametrize("risk_percent, rounding, expected", [
+    # dollar risk = 1 USD * risk% = risk * 1e6 units
+    (0.0000025, "ROUND_HALF_EVEN", 2),
+    (0.0000035, "ROUND_HALF_EVEN", 4),
+    (0.0000025, "ROUND_HALF_UP", 3),
+    (0.0000025, "ROUND_DOWN", 2),
+    (0.0000021, "ROUND_UP", 3),
+    (0.0000029, "ROUND_FLOOR", 2),
+    (0.0000021, "ROUND_CEILING", 3),
+])
+def test_rounding_policy_is_applied(risk_percent, rounding, expected):
+    assert calculate_position_sizes_fixed(1, 1, [risk_percent], rounding=rounding)[0] == [expected]
+
+def test_unknown_rounding_mode_is_rejected():
+    with pytest.raises(ValueError):
+        calculate_position_sizes_fixed(1000, 1.5, [1.0], rounding="ROUND_05UP")
+
+def test_empty_risk_levels():
+    assert calculate_position_sizes_fixed(1000, 1.5, []) == ([], [], [])
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from trade_size.engine import VECTOR_RTOL, calculate_position_sizes
+from trade_size.grid import RiskGrid, build_grid
+
+RISK_VALUES = (0.25, 0.5, 1.0, 2.0, 5.0)
+
+@pytest.fixture
+def grid(tmp_path):
+    path = tmp_path / "grid" / "risk_grid.bin"
+    build_grid(str(path), RISK_VALUES, stop_count=1000)
+    return RiskGrid.load(str(path))
+
+@pytest.mark.parametrize("stop_loss_percentage", [0.01, 0.07, 1.5, 3.33, 10.0])
+def test_on_grid_lookups_match_the_engine(grid, stop_loss_percentage):
+    risk_levels = [5.0, 0.25, 1.0, 1.0]
+    expected = calculate_position_sizes(12_345.67, stop_loss_percentage, risk_levels, 7.0)
+
+    result = grid.lookup(12_345.67, stop_loss_percentage, risk_levels, 7.0)
+
+    assert result is not None
+    for actual, wanted in zip(result, expected):
+        np.testing.assert_allclose(actual, wanted, rtol=VECTOR_RTOL)
+
+def test_grid_covers_every_stop_it_stores(grid):
+    stops = np.round(0.01 + 0.01 * np.arange(1000), 10)
+    _, expected, _ = calculate_position_sizes(1_000.0, stops[:, np.newaxis], np.array(RISK_VALUES))
+    np.testing.assert_allclose(1_000.0 * grid.factors, expected, rtol=VECTOR_RTOL)
+
+@pytest.mark.parametrize("stop_loss_percentage", [0.005, 0.015, 1.234, 10.01, -1.0])
+def test_off_grid_stops_fall_back(grid, stop_loss_percentage):
+    assert grid.lookup(10_000, stop_loss_percentage, [1.0]) is None
+
+@pytest.mark.parametrize("risk_levels", [[0.3], [1.0, 0.75], [10.0], [0.1]])
+def test_off_grid_risks_fall_back(grid, risk_levels):
+    assert grid.lookup(10_000, 1.5, risk_levels) is None
+
+def test_empty_risk_levels_give_empty_results(grid):
+    result = grid.lookup(10_000, 1.5, [])
+    assert result is not None and all(len(values) == 0 for values in result)
+
+def test_grid_without_risk_levels_falls_back(tmp_path):
+    path = str(tmp_path / "empty.bin")
+    build_grid(path, [], stop_count=10)
+    assert RiskGrid.load(path).lookup(10_000, 0.05, [1.0]) is None
+
+def test_load_refuses_other_files(tmp_path):
+    path = tmp_path / "not_a_grid.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        RiskGrid.load(str(path))
@@ -0,0 +1,39 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_SECONDS = 0.1
+HEAVY_MODULES = ("numpy", "pandas", "streamlit", "pyarrow", "asyncio")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import trade_size
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": sorted(name for name in %r if name in sys.modules)}))
+""" % (HEAVY_MODULES,)
+
+def run_probe():
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(completed.stdout)
+
+@pytest.fixture(scope="module")
+def probes():
+    # The first run may also compile bytecode; the budget is for warm imports.
+    return [run_probe() for _ in range(3)]
+
+def test_import_stays_within_budget(probes):
+    assert min(probe["elapsed"] for probe in probes) < IMPORT_BUDGET_SECONDS
+
+def test_import_loads_no_heavy_modules(probes):
+    assert probes[-1]["loaded"] == []
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from trade_size import IncrementalSizer, calculate_position_sizes
+
+def assert_matches_engine(result, capital, stop_loss_percentage, risk_levels, leverage=1.0):
+    expected = calculate_position_sizes(capital, stop_loss_percentage, risk_levels, leverage)
+    for column, expected_column in zip(result, expected):
+        np.testing.assert_allclose(column, expected_column, rtol=1e-15)
+
+def test_cache_overflow_does_not_mix_up_levels():
+    sizer = IncrementalSizer(max_cached_levels=4)
+    sizer.size(1000, 2, [1, 2, 3])
+
+    dollar_risk, position_size, _ = sizer.size(1000, 2, [1, 4, 5])
+
+    assert dollar_risk.tolist() == [10.0, 40.0, 50.0]
+    assert position_size.tolist() == [500.0, 2000.0, 2500.0]
+
+@pytest.mark.parametrize("max_cached_levels", [1, 2, 3, 5, 1_000])
+def test_results_match_the_engine_under_any_cache_size(max_cached_levels):
+    rng = np.random.default_rng(max_cached_levels)
+    sizer = IncrementalSizer(max_cached_levels=max_cached_levels)
+    for _ in range(50):
+        risk_levels = rng.choice(np.arange(1, 21) / 4, size=rng.integers(1, 8))
+        leverage = float(rng.integers(1, 20))
+        result = sizer.size(1000, 1.5, risk_levels, leverage)
+        assert_matches_engine(result, 1000, 1.5, risk_levels, leverage)
+
+def test_levels_are_reused_for_the_same_capital_and_stop():
+    sizer = IncrementalSizer()
+    sizer.size(1000, 1.5, [1, 2])
+    result = sizer.size(1000, 1.5, [2, 3], leverage=10)
+
+    assert_matches_engine(result, 1000, 1.5, [2, 3], 10)
+    assert (sizer.computed, sizer.reused) == (3, 1)
+
+def test_changing_the_stop_loss_invalidates_the_cache():
+    sizer = IncrementalSizer()
+    sizer.size(1000, 1.5, [1, 2])
+    result = sizer.size(1000, 2.5, [1, 2])
+
+    assert_matches_engine(result, 1000, 2.5, [1, 2])
+    assert sizer.reused == 0
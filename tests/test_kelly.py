@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from trade_size.kelly import estimate_sizing, to_r_multiples
+
+@pytest.mark.parametrize("r_multiples, expected", [
+    ([1.0, -0.5], 50.0),
+    ([2.0, -1.0], 25.0),
+    ([3.0, -2.0], 25.0 / 3),
+])
+def test_kelly_is_risk_per_1r(r_multiples, expected):
+    estimate = estimate_sizing(np.tile(r_multiples, 1000))
+    percentages = estimate.risk_percentages()
+
+    assert percentages["Kelly"] == pytest.approx(expected)
+    assert percentages["½ Kelly"] == pytest.approx(expected / 2)
+    assert percentages["¼ Kelly"] == pytest.approx(expected / 4)
+    # With one loss size, Kelly and the growth-optimal fraction coincide.
+    assert percentages["Optimal f"] == pytest.approx(expected, rel=1e-6)
+
+def test_kelly_does_not_depend_on_the_pnl_unit():
+    pnl = np.tile([300.0, -100.0, -200.0], 500)
+
+    from_pnl = estimate_sizing(to_r_multiples(pnl)).risk_percentages()
+    from_dollars_r = estimate_sizing(pnl / 100.0).risk_percentages()
+
+    assert from_pnl["Kelly"] == pytest.approx(from_dollars_r["Kelly"])
+
+def test_journal_without_edge_gets_zero_risk():
+    estimate = estimate_sizing(np.tile([1.0, -1.0, -1.0], 100))
+    assert estimate.risk_percentages()["Kelly"] == 0.0
+    assert estimate.optimal_risk_fraction == 0.0
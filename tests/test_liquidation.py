@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+import pytest
+
+from trade_size.liquidation import (
+    CROSS, DEFAULT_BRACKETS_PATH, ISOLATED, LONG, SHORT, BracketTable, liquidation_distances, liquidation_report,
+    load_brackets
+)
+
+BRACKETS = [
+    {"notional_cap": 50_000, "maintenance_margin_rate": 0.004, "max_leverage": 125},
+    {"notional_cap": 600_000, "maintenance_margin_rate": 0.005, "max_leverage": 100},
+    {"notional_cap": 3_000_000, "maintenance_margin_rate": 0.0065, "max_leverage": 75},
+]
+
+@pytest.fixture
+def table():
+    return BracketTable.from_brackets(BRACKETS)
+
+def maintenance(table, notional):
+    index = table.lookup(notional)
+    return notional * table.rates[index] - table.amounts[index]
+
+def test_maintenance_amounts_keep_margin_continuous(table):
+    np.testing.assert_allclose(table.amounts, [0.0, 50.0, 50.0 + 600_000 * 0.0015])
+    for cap in table.notional_caps[:-1]:
+        below, above = maintenance(table, cap), maintenance(table, np.nextafter(cap, np.inf))
+        assert above == pytest.approx(below, rel=1e-12)
+
+def test_lookup_puts_a_cap_in_its_own_bracket(table):
+    np.testing.assert_array_equal(table.lookup([1.0, 50_000, 50_001, 3_000_000, 3_000_001]), [0, 0, 1, 2, 3])
+
+@pytest.mark.parametrize("brackets", [
+    [],
+    [BRACKETS[1], BRACKETS[0]],
+    [BRACKETS[0], dict(BRACKETS[1], maintenance_margin_rate=0.001)],
+])
+def test_bad_brackets_are_refused(brackets):
+    with pytest.raises(ValueError):
+        BracketTable.from_brackets(brackets)
+
+def test_default_brackets_load_with_an_open_top():
+    tables = load_brackets(DEFAULT_BRACKETS_PATH)
+    assert tables["BTCUSDT"].notional_caps[-1] == math.inf
+
+@pytest.mark.parametrize("side", [LONG, SHORT])
+@pytest.mark.parametrize("margin_mode", [ISOLATED, CROSS])
+def test_equity_meets_maintenance_at_the_liquidation_price(table, side, margin_mode):
+    capital, leverage = 20_000.0, 20.0
+    notional = np.array([1_000.0, 50_000.0, 120_000.0, 2_500_000.0])
+    distance, rate, rejected = liquidation_distances(capital, notional, leverage, table, side, margin_mode)
+
+    margin = notional / leverage if margin_mode == ISOLATED else capital
+    move = distance / 100.0
+    price = 1.0 - move if side == LONG else 1.0 + move
+    pnl = notional * (price - 1.0) if side == LONG else notional * (1.0 - price)
+    index = table.lookup(notional)
+    held = notional * price * table.rates[index] - table.amounts[index]
+
+    # Cross margin on a small position never liquidates a long before zero.
+    live = distance < 100.0
+    np.testing.assert_allclose((margin + pnl)[live], held[live], rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(rate, table.rates[index] * 100.0)
+    assert not rejected.any()
+
+def test_cross_margin_backs_the_position_with_the_whole_capital(table):
+    isolated, _, _ = liquidation_distances(10_000, [100_000.0], 50, table, LONG, ISOLATED)
+    cross, _, _ = liquidation_distances(10_000, [100_000.0], 50, table, LONG, CROSS)
+    assert cross[0] > isolated[0]
+
+def test_notional_past_the_last_bracket_has_no_liquidation(table):
+    distance, _, rejected = liquidation_distances(1e7, [1_000.0, 5_000_000.0], 2, table)
+    assert not math.isnan(distance[0]) and math.isnan(distance[1])
+    np.testing.assert_array_equal(rejected, [False, True])
+
+def test_leverage_above_the_bracket_maximum_is_rejected(table):
+    _, _, rejected = liquidation_distances(1e6, [10_000.0, 100_000.0, 1_000_000.0], 100, table)
+    np.testing.assert_array_equal(rejected, [False, False, True])
+
+def test_report_flags_stops_at_or_past_liquidation(table):
+    report, stop_past_liquidation, rejected = liquidation_report(10_000, 2.0, [1, 5, 100], 50, table, LONG, CROSS)
+
+    distance = report.iloc[0].to_numpy()
+    assert distance[0] == 100.0 and distance[2] < 2.0
+    np.testing.assert_array_equal(stop_past_liquidation, [False, False, True])
+    assert list(report.columns) == ["1%", "5%", "100%"]
+    assert not rejected.any()
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+import trade_size.microbatch
+from trade_size.batch import size_requests
+from trade_size.microbatch import MicroBatcher
+
+def request(index):
+    return {"capital": 1_000.0 + index, "stop_loss_percentage": 1.0 + index / 10, "risk_levels": [0.5, index + 1.0],
+            "leverage": 2.0}
+
+@pytest.fixture
+def batch_sizes(monkeypatch):
+    sizes = []
+
+    def record(requests):
+        sizes.append(len(requests))
+        return size_requests(requests)
+
+    monkeypatch.setattr(trade_size.microbatch, "size_requests", record)
+    return sizes
+
+def test_full_batches_flush_without_waiting(batch_sizes):
+    async def run():
+        batcher = MicroBatcher(max_batch_size=2, max_wait_us=10_000_000)
+        async with batcher:
+            tasks = [asyncio.ensure_future(batcher.size(**request(index))) for index in range(4)]
+            await asyncio.wait_for(asyncio.gather(*tasks), 5)
+        return batcher
+
+    batcher = asyncio.run(run())
+    assert batch_sizes == [2, 2]
+    assert (batcher.batches, batcher.requests) == (2, 4)
+
+def test_partial_batch_flushes_after_max_wait(batch_sizes):
+    async def run():
+        batcher = MicroBatcher(max_batch_size=100, max_wait_us=200_000)
+        tasks = [asyncio.ensure_future(batcher.size(**request(index))) for index in range(3)]
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert not any(task.done() for task in tasks)
+
+        await asyncio.wait_for(asyncio.gather(*tasks), 5)
+
+    asyncio.run(run())
+    assert batch_sizes == [3]
+
+def test_leaving_the_context_flushes_pending_requests(batch_sizes):
+    async def run():
+        async with MicroBatcher(max_wait_us=10_000_000) as batcher:
+            task = asyncio.ensure_future(batcher.size(**request(0)))
+            await asyncio.sleep(0)
+        return await asyncio.wait_for(task, 5)
+
+    assert asyncio.run(run()) == size_requests([request(0)])[0]
+    assert batch_sizes == [1]
+
+def test_each_caller_gets_its_own_result_in_order():
+    requests = [request(index) for index in range(7)]
+    requests[3] = dict(requests[3], stop_loss_percentage=0)
+    requests[5] = dict(requests[5], risk_levels=["x"])
+
+    async def run():
+        batcher = MicroBatcher(max_batch_size=3)
+        return await asyncio.gather(*(batcher.size(**item) for item in requests))
+
+    responses = asyncio.run(run())
+
+    assert responses == size_requests(requests)
+    assert "error" in responses[3] and "error" in responses[5]
+    assert responses[6]["risk_levels"] == [0.5, 7.0]
+
+def test_a_failing_batch_fails_every_caller_in_it(monkeypatch):
+    def explode(requests):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(trade_size.microbatch, "size_requests", explode)
+
+    async def run():
+        batcher = MicroBatcher(max_batch_size=2)
+        return await asyncio.gather(*(batcher.size(**request(index)) for index in range(2)), return_exceptions=True)
+
+    responses = asyncio.run(run())
+    assert [type(response) for response in responses] == [RuntimeError, RuntimeError]
+
+@pytest.mark.parametrize("max_batch_size, max_wait_us", [(0, 200), (1, -1)])
+def test_bad_settings_are_refused(max_batch_size, max_wait_us):
+    with pytest.raises(ValueError):
+        MicroBatcher(max_batch_size, max_wait_us)
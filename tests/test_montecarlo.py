@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+import pytest
+
+import trade_size.disk_cache
+import trade_size.montecarlo
+from trade_size.disk_cache import DiskCache
+from trade_size.montecarlo import simulate_equity
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARGUMENTS = ([0.5, 1.0, 2.0], 0.45, 2.0, 50, 5_000)
+
+def test_results_do_not_depend_on_the_worker_count(monkeypatch):
+    monkeypatch.setattr(trade_size.montecarlo, "PARALLEL_MIN_STEPS", 0)
+
+    serial = simulate_equity(*ARGUMENTS, seed=7, workers=1)
+    parallel = simulate_equity(*ARGUMENTS, seed=7, workers=2)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+
+def test_small_runs_stay_in_process(monkeypatch):
+    def refuse(*args, **kwargs):
+        raise AssertionError("a process pool was started")
+
+    monkeypatch.setattr(trade_size.montecarlo, "ProcessPoolExecutor", refuse)
+    simulate_equity(*ARGUMENTS, seed=7, workers=4)
+
+def test_disk_memo_key_ignores_the_worker_count(tmp_path):
+    calls = []
+
+    @DiskCache(str(tmp_path / "cache.sqlite3")).memoize("monte_carlo", ignore=("workers",))
+    def simulate(levels, seed, workers=1):
+        calls.append(workers)
+        return levels
+
+    simulate([1.0], seed=1, workers=1)
+    simulate([1.0], seed=1, workers=4)
+    simulate([1.0], seed=2, workers=4)
+    assert calls == [1, 4]
+
+def monte_carlo_tables(at):
+    return [frame for frame in at.dataframe if "احتمال ورشکستگی (٪)" in frame.value.columns]
+
+def test_stored_simulation_is_hidden_when_inputs_change(tmp_path, monkeypatch):
+    pytest.importorskip("streamlit")
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.setattr(trade_size.disk_cache, "_default_cache", DiskCache(str(tmp_path / "cache.sqlite3")))
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=60)
+    at.run()
+    assert at.number_input(key="mc_workers").value == 1
+
+    at.number_input(key="mc_paths").set_value(100).run()
+    at.button(key="mc_run").click().run()
+    assert len(monte_carlo_tables(at)) == 1
+
+    at.text_input(key="risk_inputs").set_value("0.5, 1, 3").run()
+    assert not at.exception
+    assert monte_carlo_tables(at) == []
@@ -0,0 +1,87 @@
+import random
+import time
+
+import pytest
+
+from trade_size.parsing import MAX_INPUT_LENGTH, MAX_RISK_LEVELS, parse_risk_levels
+
+# Linear-time parsing of a 20 KB input takes well under 20ms; a quadratic
+# (backtracking) regression on the same inputs takes seconds.
+PARSE_BUDGET_SECONDS = 0.05
+FUZZ_BUDGET_SECONDS = 2.0
+FUZZ_ALPHABET = "0123456789.,،:*^eE+- \tx"
+
+ADVERSARIAL_INPUTS = {
+    "digits": "1" * MAX_INPUT_LENGTH,
+    "dotted": "1." * (MAX_INPUT_LENGTH // 2),
+    "exponents": "1e" * (MAX_INPUT_LENGTH // 2),
+    "trailing_exponent": "1" * (MAX_INPUT_LENGTH - 2) + "e+",
+    "colons": "1:" * (MAX_INPUT_LENGTH // 2),
+    "geometric": "1*2^" * (MAX_INPUT_LENGTH // 4),
+    "geometric_dots": "1*2^1.." * (MAX_INPUT_LENGTH // 7),
+    "carets": "^" * MAX_INPUT_LENGTH,
+    "signs": "+-" * (MAX_INPUT_LENGTH // 2),
+    "commas": "," * MAX_INPUT_LENGTH,
+    "persian_commas": "1،" * (MAX_INPUT_LENGTH // 2),
+    "bad_tokens": "x," * (MAX_INPUT_LENGTH // 2),
+    "ranges": "0.1:0.2:0.1," * (MAX_INPUT_LENGTH // 12),
+    "whitespace_runs": ("1" + " " * 99 + ",") * (MAX_INPUT_LENGTH // 101),
+}
+
+@pytest.fixture(scope="module", autouse=True)
+def warm_up():
+    # The first parse imports numpy; keep that out of the budgets.
+    parse_risk_levels("1")
+
+def timed_parse(risk_input):
+    start = time.perf_counter()
+    result = parse_risk_levels(risk_input)
+    return result, time.perf_counter() - start
+
+@pytest.mark.parametrize("name", sorted(ADVERSARIAL_INPUTS))
+def test_adversarial_inputs_parse_within_budget(name):
+    risk_input = ADVERSARIAL_INPUTS[name]
+    assert len(risk_input) <= MAX_INPUT_LENGTH
+
+    (risk_levels, error), elapsed = timed_parse(risk_input)
+
+    assert (risk_levels is None) != (error is None)
+    assert elapsed < PARSE_BUDGET_SECONDS
+
+def test_random_inputs_parse_within_budget():
+    rng = random.Random(20_000)
+    start = time.perf_counter()
+    for _ in range(200):
+        length = rng.choice((10, 100, 1_000, MAX_INPUT_LENGTH))
+        risk_input = "".join(rng.choice(FUZZ_ALPHABET) for _ in range(length))
+        risk_levels, error = parse_risk_levels(risk_input)
+        assert (risk_levels is None) != (error is None)
+    assert time.perf_counter() - start < FUZZ_BUDGET_SECONDS
+
+def test_input_length_is_enforced():
+    risk_levels, error = parse_risk_levels("1" * (MAX_INPUT_LENGTH + 1))
+    assert risk_levels is None
+    assert f"{MAX_INPUT_LENGTH:,}" in error
+
+def test_expanded_level_count_is_enforced():
+    risk_levels, error = parse_risk_levels("0:100:0.00001")
+    assert risk_levels is None
+    assert f"{MAX_RISK_LEVELS:,}" in error
+
+def test_every_bad_token_is_reported_with_its_position():
+    risk_levels, error = parse_risk_levels("1, abc, 2, 3:1:1, 0.1*0^0..2, 4..")
+
+    assert risk_levels is None
+    assert "'abc' در موقعیت 4" in error
+    assert "(موقعیت 12)" in error
+    assert "(موقعیت 19)" in error
+    assert "'4..' در موقعیت 31" in error
+
+def test_long_bad_tokens_are_truncated_in_messages():
+    _, error = parse_risk_levels("x" * 5_000)
+    assert len(error) < 200
+
+def test_valid_mixed_input():
+    risk_levels, error = parse_risk_levels("0.5، 1:2:0.5, 0.1*2^0..2, 1")
+    assert error is None
+    assert risk_levels.tolist() == [0.1, 0.2, 0.4, 0.5, 1.0, 1.5, 2.0]
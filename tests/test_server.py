@@ -0,0 +1,80 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from trade_size import size_requests
+from trade_size.server import SIZE_PATH, create_server
+from trade_size.validation import NOT_A_NUMBER_ERROR
+
+@pytest.fixture
+def server():
+    server = create_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def raw_request(server, request: bytes) -> bytes:
+    with socket.create_connection(server.server_address[:2], timeout=5) as connection:
+        connection.sendall(request)
+        connection.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+def post(server, body: bytes, content_length=None) -> bytes:
+    length = len(body) if content_length is None else content_length
+    return raw_request(server, (
+        f"POST {SIZE_PATH} HTTP/1.1\r\nHost: test\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {length}\r\nConnection: close\r\n\r\n"
+    ).encode("ascii") + body)
+
+@pytest.mark.parametrize("field", ["capital", "stop_loss_percentage", "leverage", "risk_levels"])
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_values_are_rejected(field, value):
+    request = {"capital": 1000, "stop_loss_percentage": 1.5, "risk_levels": [1.0], "leverage": 2}
+    request[field] = [1.0, value] if field == "risk_levels" else value
+    assert size_requests([request]) == [{"error": NOT_A_NUMBER_ERROR}]
+
+def test_nan_in_json_body_returns_strict_json(server):
+    response = post(server, b'[{"capital": NaN, "stop_loss_percentage": 1.5, "risk_levels": [1]},'
+                            b' {"capital": 1000, "stop_loss_percentage": 1.5, "risk_levels": [Infinity]}]')
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200")
+    assert json.loads(body, parse_constant=pytest.fail) == [{"error": NOT_A_NUMBER_ERROR}] * 2
+
+@pytest.mark.parametrize("content_length", ["abc", "-5", "1.5"])
+def test_bad_content_length_returns_400(server, content_length):
+    response = post(server, b"[]", content_length=content_length)
+    assert response.startswith(b"HTTP/1.1 400")
+    assert "error" in json.loads(response.partition(b"\r\n\r\n")[2])
+
+def test_overflowing_results_are_rejected_per_request():
+    huge = {"capital": 1e306, "stop_loss_percentage": 0.01, "risk_levels": [1.0, 99.0]}
+    fine = {"capital": 1000, "stop_loss_percentage": 1.5, "risk_levels": [1.0]}
+
+    responses = size_requests([fine, huge, fine])
+
+    assert responses[1] == {"error": NOT_A_NUMBER_ERROR}
+    assert responses[0] == responses[2]
+    assert responses[0]["position_size"] == [pytest.approx(1000 / 1.5)]
+
+def test_overflowing_request_returns_strict_json(server):
+    response = post(server, b'{"capital": 1e306, "stop_loss_percentage": 0.01, "risk_levels": [99]}')
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200")
+    assert json.loads(body, parse_constant=pytest.fail) == [{"error": NOT_A_NUMBER_ERROR}]
+
+def test_non_finite_responses_fail_loudly(server, monkeypatch):
+    import trade_size.server
+
+    monkeypatch.setattr(trade_size.server, "size_requests", lambda requests: [{"position_size": [float("inf")]}])
+    response = post(server, b"[]")
+    assert response.startswith(b"HTTP/1.1 500")
@@ -0,0 +1,72 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from trade_size.sweeps import downsample_axis, downsample_grid, sweep_leverage
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_sweeping_block_mean_risks_matches_downsampling_the_full_sweep():
+    risks = np.linspace(0.01, 50.0, 5000)
+    leverages, margins = sweep_leverage(10_000, 1.5, risks)
+    expected, expected_risks, _ = downsample_grid(margins, risks, leverages, 200, len(leverages))
+
+    swept_risks = downsample_axis(risks, 200)
+    _, swept = sweep_leverage(10_000, 1.5, swept_risks)
+
+    np.testing.assert_allclose(swept_risks, expected_risks)
+    np.testing.assert_allclose(swept, expected, rtol=1e-12)
+
+def test_downsample_axis_keeps_short_axes():
+    np.testing.assert_array_equal(downsample_axis([1.0, 2.0, 3.0], 200), [1.0, 2.0, 3.0])
+
+@pytest.fixture
+def app_test():
+    pytest.importorskip("streamlit")
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=60)
+    at.run()
+    at.text_input(key="risk_inputs").set_value("0.01:50:0.01").run()
+    return at
+
+def last_chart(at):
+    return json.loads(at.get("plotly_chart")[-1].proto.spec)["data"]
+
+def test_leverage_sweep_waits_for_its_toggle(app_test):
+    charts = len(app_test.get("plotly_chart"))
+
+    app_test.checkbox(key="leverage_sweep_show").check().run()
+
+    assert not app_test.exception
+    assert len(app_test.get("plotly_chart")) == charts + 1
+
+def test_leverage_sweep_draws_a_bounded_subset(app_test):
+    import app
+
+    app_test.checkbox(key="leverage_sweep_show").check().run()
+    assert len(last_chart(app_test)) == app.LEVERAGE_SWEEP_MAX_LINES
+
+    app_test.radio(key="leverage_chart").set_value("سطحی (Surface)").run()
+    surface, = last_chart(app_test)
+    assert surface["z"]["shape"] == f"{app.HEATMAP_MAX_CELLS}, 125"
+
+def test_heatmap_sweep_waits_for_its_toggle(monkeypatch):
+    pytest.importorskip("streamlit")
+    from streamlit.testing.v1 import AppTest
+
+    from trade_size.profiling import PROFILE_ENV_VAR
+
+    monkeypatch.setenv(PROFILE_ENV_VAR, "1")
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=60)
+    at.run()
+    at.number_input(key="stop_loss_percentage").set_value(2.5).run()
+    assert at.session_state["profiler"].last_counts.get("heatmap_sweep", 0) == 0
+
+    at.checkbox(key="heatmap_show").check().run()
+
+    assert not at.exception
+    assert at.session_state["profiler"].last_counts["heatmap_sweep"] == 1
+    assert last_chart(at)[0]["type"] == "heatmap"
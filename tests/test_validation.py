@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from trade_size import parse_risk_levels, validate_inputs
+from trade_size.validation import RISK_EMPTY_ERROR, RISK_MAX_ERROR, RISK_MIN_ERROR
+
+def test_parser_returns_a_sorted_unique_array():
+    risk_levels, error = parse_risk_levels("2, 0.5, 1, 0.5")
+    assert error is None
+    assert isinstance(risk_levels, np.ndarray) and risk_levels.dtype == np.float64
+    assert risk_levels.tolist() == [0.5, 1.0, 2.0]
+
+def test_large_ladder_stays_an_array():
+    risk_levels, error = parse_risk_levels("0.0001:99.9999:0.0001")
+    assert error is None
+    assert isinstance(risk_levels, np.ndarray)
+    assert len(risk_levels) == 999_999
+    assert validate_inputs(1000, 1.5, risk_levels, 1) is None
+
+@pytest.mark.parametrize("risk_levels, expected", [
+    ([1.0, 150.0, -1.0], RISK_MAX_ERROR),
+    ([1.0, -1.0, 150.0], RISK_MIN_ERROR),
+    ([0.0], RISK_MIN_ERROR),
+    ([100.0], RISK_MAX_ERROR),
+    ([0.5, 99.5], None),
+    ([], RISK_EMPTY_ERROR),
+])
+def test_array_and_list_validation_agree(risk_levels, expected):
+    assert validate_inputs(1000, 1.5, risk_levels, 1) == expected
+    assert validate_inputs(1000, 1.5, np.asarray(risk_levels, dtype=np.float64), 1) == expected
+
+def test_batch_validation_rejects_non_finite_values():
+    from trade_size.validation import NOT_A_NUMBER_ERROR, validate_inputs_batch
+
+    capital = np.array([1000.0, np.inf, float("1e400"), -np.inf, 1000.0])
+    leverage = np.array([1.0, 1.0, 1.0, 1.0, np.inf])
+    errors = validate_inputs_batch(capital, 1.5, 1.0, leverage)
+
+    assert errors[0] is None
+    assert list(errors[1:]) == [NOT_A_NUMBER_ERROR] * 4
+
+@pytest.mark.parametrize("risk_input, first", [
+    ("0.01*10^-12..0", 1e-14),
+    ("1.5*10^-20..-18", 1.5e-20),
+    ("0.000000000001:0.000000000003:0.000000000001", 1e-12),
+])
+def test_tiny_expanded_levels_keep_their_value(risk_input, first):
+    risk_levels, error = parse_risk_levels(risk_input)
+    assert error is None
+    assert risk_levels[0] == first
+    assert validate_inputs(1000, 1.5, risk_levels, 1) is None
+
+def test_expanded_levels_drop_float_noise():
+    risk_levels, _ = parse_risk_levels("0.1:1:0.1, 0.1*3^0..4")
+    assert 0.3 in risk_levels.tolist() and 2.7 in risk_levels.tolist()
+    assert not any("0000000" in repr(level) for level in risk_levels.tolist())
@@ -0,0 +1,46 @@
+from .batch import size_requests
+from .cache import LRUCache, cached_risk_management_table, table_cache
+from .engine import VECTOR_RTOL, calculate_position_sizes, calculate_position_sizes_decimal
+from .fixed_point import (
+    FIXED_POINT_ROUNDING_MODES,
+    FIXED_POINT_SCALE,
+    calculate_position_sizes_fixed,
+    from_fixed_point,
+    to_fixed_point,
+)
+from .grid import RiskGrid, load_default_grid
+from .incremental import IncrementalSizer
+from .parsing import parse_risk_levels
+from .table import create_risk_management_table
+from .validation import validate_inputs
+
+__all__ = [
+    "FIXED_POINT_ROUNDING_MODES",
+    "FIXED_POINT_SCALE",
+    "IncrementalSizer",
+    "LRUCache",
+    "MicroBatcher",
+    "RiskGrid",
+    "VECTOR_RTOL",
+    "cached_risk_management_table",
+    "calculate_position_sizes",
+    "calculate_position_sizes_decimal",
+    "calculate_position_sizes_fixed",
+    "create_risk_management_table",
+    "from_fixed_point",
+    "load_default_grid",
+    "parse_risk_levels",
+    "size_requests",
+    "table_cache",
+    "to_fixed_point",
+    "validate_inputs",
+]
+
+# MicroBatcher pulls in asyncio, which would dominate the import time of
+# the package, so it is only imported when first used.
+def __getattr__(name):
+    if name == "MicroBatcher":
+        from .microbatch import MicroBatcher
+
+        return MicroBatcher
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
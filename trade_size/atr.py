@@ -0,0 +1,167 @@
+import math
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from .bulk import STOP_LOSS_COLUMN
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+HIGH_COLUMN = "high"
+LOW_COLUMN = "low"
+CLOSE_COLUMN = "close"
+PRICE_COLUMNS = (HIGH_COLUMN, LOW_COLUMN, CLOSE_COLUMN)
+SYMBOL_COLUMN = "symbol"
+
+DEFAULT_ATR_PERIOD = 14
+DEFAULT_ATR_MULTIPLIER = 1.5
+
+# Wilder's ATR is the recursion atr = a * atr + (1 - a) * tr with
+# a = (period - 1) / period. Batches solve it in closed form over blocks
+# short enough that a ** -block stays below this bound.
+BLOCK_GROWTH_LIMIT = 1e6
+
+# The state is everything the recursion needs, so a stream can be resumed
+# from to_dict() without replaying any history. A state belongs to one
+# price series; symbol records which one once it is known.
+# Bars with a missing or non-finite price are skipped: they get NaN and
+# leave the state untouched, so one bad cell cannot poison later bars.
+class ATRState:
+    def __init__(self, period: int = DEFAULT_ATR_PERIOD, symbol: Optional[str] = None):
+        if period < 1:
+            raise ValueError("دوره ATR باید حداقل ۱ باشد.")
+        self.period = int(period)
+        self.symbol = symbol
+        self.count = 0
+        self.seed_sum = 0.0
+        self.atr: Optional[float] = None
+        self.previous_close: Optional[float] = None
+
+    def is_finite(self) -> bool:
+        values = (self.seed_sum, self.atr, self.previous_close)
+        return all(value is None or math.isfinite(value) for value in values)
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        if not all(math.isfinite(value) for value in (high, low, close)):
+            return math.nan
+        true_range = float(high - low)
+        if self.previous_close is not None:
+            true_range = max(true_range, float(abs(high - self.previous_close)), float(abs(low - self.previous_close)))
+        self.previous_close = float(close)
+        self.count += 1
+
+        if self.atr is None:
+            self.seed_sum += true_range
+            if self.count == self.period:
+                self.atr = self.seed_sum / self.period
+        else:
+            self.atr += (true_range - self.atr) / self.period
+        return self.atr
+
+    def update_many(self, high, low, close) -> "np.ndarray":
+        import numpy as np
+
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+        valid = np.isfinite(high) & np.isfinite(low) & np.isfinite(close)
+        if valid.all():
+            return self._update_valid(high, low, close)
+
+        atr = np.full(len(close), np.nan)
+        atr[valid] = self._update_valid(high[valid], low[valid], close[valid])
+        return atr
+
+    def _update_valid(self, high: "np.ndarray", low: "np.ndarray", close: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+
+        atr = np.full(len(close), np.nan)
+        if not len(close):
+            return atr
+
+        previous_close = np.concatenate(([np.nan if self.previous_close is None else self.previous_close], close[:-1]))
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+        start = 0
+        if self.atr is None:
+            start = min(self.period - self.count, len(close))
+            self.seed_sum += float(true_range[:start].sum())
+            self.count += start
+            if self.count < self.period:
+                self.previous_close = float(close[-1])
+                return atr
+            self.atr = self.seed_sum / self.period
+            atr[start - 1] = self.atr
+
+        decay = (self.period - 1) / self.period
+        if decay == 0:
+            atr[start:] = true_range[start:]
+        else:
+            block = max(int(math.log(BLOCK_GROWTH_LIMIT) / -math.log(decay)), 1)
+            level = self.atr
+            for block_start in range(start, len(close), block):
+                values = true_range[block_start:block_start + block]
+                powers = decay ** np.arange(1, len(values) + 1)
+                # atr_k = a^k * (atr_0 + (1 - a) * sum_{j<=k} tr_j * a^-j)
+                atr[block_start:block_start + len(values)] = powers * (level + np.cumsum(values / powers) * (1.0 - decay))
+                level = atr[block_start + len(values) - 1]
+
+        self.atr = float(atr[-1])
+        self.count += len(close) - start
+        self.previous_close = float(close[-1])
+        return atr
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "period": self.period,
+            "symbol": self.symbol,
+            "count": self.count,
+            "seed_sum": self.seed_sum,
+            "atr": self.atr,
+            "previous_close": self.previous_close,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ATRState":
+        state = cls(data["period"], data.get("symbol"))
+        state.count = int(data["count"])
+        state.seed_sum = float(data["seed_sum"])
+        state.atr = None if data["atr"] is None else float(data["atr"])
+        state.previous_close = None if data["previous_close"] is None else float(data["previous_close"])
+        if not state.is_finite():
+            raise ValueError("وضعیت ATR شامل مقدار نامعتبر (NaN یا بی‌نهایت) است.")
+        return state
+
+def bind_symbol(state: ATRState, frame: "pd.DataFrame") -> Optional[str]:
+    if SYMBOL_COLUMN not in frame:
+        return None
+    symbols = set(frame[SYMBOL_COLUMN].dropna().astype(str))
+    if state.symbol is not None:
+        symbols.add(state.symbol)
+    if len(symbols) > 1:
+        return (
+            "ATR روی یک سری قیمت محاسبه می‌شود؛ فایل ورودی و فایل وضعیت باید فقط یک نماد داشته باشند "
+            f"(نمادها: {', '.join(sorted(symbols))})."
+        )
+    if symbols:
+        state.symbol = symbols.pop()
+    return None
+
+def atr_stop_percentages(atr, close, multiplier: float = DEFAULT_ATR_MULTIPLIER) -> "np.ndarray":
+    import numpy as np
+
+    return multiplier * np.asarray(atr, dtype=np.float64) / np.asarray(close, dtype=np.float64) * 100.0
+
+def add_atr_stops(
+    frame: "pd.DataFrame",
+    state: ATRState,
+    multiplier: float = DEFAULT_ATR_MULTIPLIER,
+    column: str = STOP_LOSS_COLUMN
+) -> "pd.DataFrame":
+    import pandas as pd
+
+    high, low, close = (pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype="float64") for name in PRICE_COLUMNS)
+    frame = frame.copy()
+    # Bars before the ATR is seeded get NaN and are rejected by validation.
+    frame[column] = atr_stop_percentages(state.update_many(high, low, close), close, multiplier)
+    return frame
@@ -0,0 +1,163 @@
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
+
+from .engine import calculate_position_sizes
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+OPEN_COLUMN = "open"
+HIGH_COLUMN = "high"
+LOW_COLUMN = "low"
+CLOSE_COLUMN = "close"
+SIGNAL_COLUMN = "signal"
+TIME_COLUMN = "timestamp"
+BAR_COLUMNS = (OPEN_COLUMN, HIGH_COLUMN, LOW_COLUMN, CLOSE_COLUMN, SIGNAL_COLUMN)
+
+# Exits are searched in windows that double in size, so a trade costs
+# work proportional to its length and the bars are scanned once overall.
+EXIT_SEARCH_WINDOW = 64
+
+def write_bars(frame: "pd.DataFrame", path: str) -> None:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    # Uncompressed, so the file can be memory-mapped without decoding.
+    feather.write_feather(pa.Table.from_pandas(frame, preserve_index=False), path, compression="uncompressed")
+
+def load_bars(path: str) -> Dict[str, "np.ndarray"]:
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    missing = [column for column in BAR_COLUMNS if column not in table.column_names]
+    if missing:
+        raise ValueError(f"ستون‌های لازم در فایل قیمت وجود ندارند: {', '.join(missing)}")
+
+    columns = BAR_COLUMNS + ((TIME_COLUMN,) if TIME_COLUMN in table.column_names else ())
+    return {column: table.column(column).to_numpy() for column in columns}
+
+def _find_exit(
+    bars: Dict[str, "np.ndarray"],
+    entry_bar: int,
+    direction: int,
+    stop_price: float,
+    target_price: Optional[float]
+) -> Tuple[int, float, int]:
+    import numpy as np
+
+    opens, highs, lows, signals = (bars[column] for column in (OPEN_COLUMN, HIGH_COLUMN, LOW_COLUMN, SIGNAL_COLUMN))
+    last_bar = len(opens) - 1
+    start, window = entry_bar, EXIT_SEARCH_WINDOW
+
+    while start <= last_bar:
+        stop = min(start + window, last_bar + 1)
+        if direction > 0:
+            price_hit = lows[start:stop] <= stop_price
+            if target_price is not None:
+                price_hit |= highs[start:stop] >= target_price
+        else:
+            price_hit = highs[start:stop] >= stop_price
+            if target_price is not None:
+                price_hit |= lows[start:stop] <= target_price
+        # A signal change on bar j closes the trade at the next bar's open,
+        # which comes before anything that can happen inside that bar.
+        signal_hit = signals[start:stop] != direction
+        signal_hit[-1] &= stop <= last_bar
+
+        price_bar = start + int(np.argmax(price_hit)) if price_hit.any() else None
+        signal_bar = start + int(np.argmax(signal_hit)) if signal_hit.any() else None
+
+        if signal_bar is not None and (price_bar is None or signal_bar < price_bar):
+            return signal_bar + 1, float(opens[signal_bar + 1]), signal_bar
+        if price_bar is not None:
+            bar_open = opens[price_bar]
+            stopped = lows[price_bar] <= stop_price if direction > 0 else highs[price_bar] >= stop_price
+            # Stop first when both levels are inside one bar; gaps fill at the open.
+            if stopped:
+                fill = min(bar_open, stop_price) if direction > 0 else max(bar_open, stop_price)
+            else:
+                fill = max(bar_open, target_price) if direction > 0 else min(bar_open, target_price)
+            return price_bar, float(fill), price_bar
+
+        start, window = stop, window * 2
+
+    return last_bar, float(bars[CLOSE_COLUMN][last_bar]), last_bar
+
+def extract_trades(
+    bars: Dict[str, "np.ndarray"],
+    stop_loss_percentage: float,
+    reward_risk: Optional[float] = None
+) -> "pd.DataFrame":
+    import numpy as np
+    import pandas as pd
+
+    signals = np.asarray(bars[SIGNAL_COLUMN])
+    opens = bars[OPEN_COLUMN]
+    previous = np.concatenate(([0], signals[:-1]))
+    # A signal is acted on at the next bar's open, never on its own bar.
+    entries = np.flatnonzero((signals != 0) & (signals != previous) & (np.arange(len(signals)) < len(signals) - 1))
+
+    stop_fraction = stop_loss_percentage / 100.0
+    trades = []
+    position = 0
+    while position < len(entries):
+        signal_bar = int(entries[position])
+        entry_bar = signal_bar + 1
+        direction = 1 if signals[signal_bar] > 0 else -1
+        entry_price = float(opens[entry_bar])
+        stop_price = entry_price * (1.0 - direction * stop_fraction)
+        target_price = None
+        if reward_risk is not None:
+            target_price = entry_price * (1.0 + direction * stop_fraction * reward_risk)
+
+        exit_bar, exit_price, resume_bar = _find_exit(bars, entry_bar, direction, stop_price, target_price)
+        trades.append((entry_bar, exit_bar, direction, entry_price, exit_price))
+        position = int(np.searchsorted(entries, max(resume_bar, entry_bar)))
+
+    return pd.DataFrame(trades, columns=["entry_bar", "exit_bar", "direction", "entry_price", "exit_price"])
+
+def backtest_fixed_fractional(
+    bars: Dict[str, "np.ndarray"],
+    capital: float,
+    stop_loss_percentage: float,
+    risk_levels: Sequence[float],
+    leverage: float = 1.0,
+    reward_risk: Optional[float] = 2.0,
+    fee_percentage: float = 0.0
+) -> Tuple["pd.DataFrame", "pd.DataFrame"]:
+    import numpy as np
+    import pandas as pd
+
+    trades = extract_trades(bars, stop_loss_percentage, reward_risk)
+    risks = np.asarray(risk_levels, dtype=np.float64)
+
+    # Sizing is proportional to equity, so sizing one dollar gives each
+    # level's exposure; margin above the equity caps the position.
+    _, position_per_dollar, margin_per_dollar = calculate_position_sizes(1.0, stop_loss_percentage, risks, leverage)
+    capped = margin_per_dollar > 1.0
+    exposure = np.where(capped, leverage, position_per_dollar)
+
+    price_ratio = (trades["exit_price"] / trades["entry_price"]).to_numpy()
+    trade_return = trades["direction"].to_numpy() * (price_ratio - 1.0)
+    fees = (1.0 + price_ratio) * fee_percentage / 100.0
+
+    growth = 1.0 + exposure[:, np.newaxis] * (trade_return - fees)[np.newaxis, :]
+    equity = capital * np.cumprod(np.maximum(growth, 0.0), axis=1)
+
+    labels = [f"{risk}%" for risk in risk_levels]
+    exit_bars = trades["exit_bar"].to_numpy()
+    index = bars[TIME_COLUMN][exit_bars] if TIME_COLUMN in bars else exit_bars
+    curves = pd.DataFrame(equity.T, index=pd.Index(index, name="exit"), columns=labels)
+
+    with_start = np.concatenate((np.full((len(risks), 1), float(capital)), equity), axis=1)
+    drawdown = 1.0 - with_start / np.maximum.accumulate(with_start, axis=1)
+    summary = pd.DataFrame({
+        "سرمایه نهایی": with_start[:, -1],
+        "بازده (٪)": (with_start[:, -1] / capital - 1.0) * 100.0,
+        "حداکثر افت سرمایه (٪)": drawdown.max(axis=1) * 100.0,
+        "تعداد معاملات": len(trades),
+        "نرخ برد (٪)": float(np.mean(trade_return > fees) * 100.0) if len(trades) else 0.0,
+        "محدود به مارجین": capped,
+    }, index=pd.Index(labels, name="سطح ریسک"))
+
+    return curves, summary
@@ -0,0 +1,83 @@
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from .engine import calculate_position_sizes
+from .validation import NOT_A_NUMBER_ERROR, validate_inputs
+
+INVALID_REQUEST_ERROR = "درخواست باید یک شیء JSON شامل capital، stop_loss_percentage و risk_levels باشد."
+
+def _coerce_request(request: Any) -> Tuple[Optional[tuple], Optional[str]]:
+    if not isinstance(request, dict):
+        return None, INVALID_REQUEST_ERROR
+
+    try:
+        capital = float(request["capital"])
+        stop_loss_percentage = float(request["stop_loss_percentage"])
+        leverage = float(request.get("leverage", 1.0))
+        risk_levels = request["risk_levels"]
+        if not isinstance(risk_levels, list):
+            risk_levels = [risk_levels]
+        risk_levels = [float(risk) for risk in risk_levels]
+    except KeyError:
+        return None, INVALID_REQUEST_ERROR
+    except (TypeError, ValueError):
+        return None, NOT_A_NUMBER_ERROR
+
+    # json.loads accepts NaN and Infinity, which would come back out as
+    # invalid JSON; the comparisons in validate_inputs let them through.
+    if not all(math.isfinite(value) for value in (capital, stop_loss_percentage, leverage, *risk_levels)):
+        return None, NOT_A_NUMBER_ERROR
+
+    error = validate_inputs(capital, stop_loss_percentage, risk_levels, leverage)
+    if error:
+        return None, error
+
+    return (capital, stop_loss_percentage, risk_levels, leverage), None
+
+def size_requests(requests: List[Any]) -> List[Dict[str, Any]]:
+    import numpy as np
+
+    responses: List[Dict[str, Any]] = [{} for _ in requests]
+    valid_positions, valid_inputs = [], []
+    for position, request in enumerate(requests):
+        inputs, error = _coerce_request(request)
+        if error:
+            responses[position] = {"error": error}
+        else:
+            valid_positions.append(position)
+            valid_inputs.append(inputs)
+
+    if not valid_inputs:
+        return responses
+
+    # Flatten every (request, risk level) pair into one vectorized call.
+    counts = np.fromiter((len(inputs[2]) for inputs in valid_inputs), dtype=np.int64, count=len(valid_inputs))
+    capital = np.repeat([inputs[0] for inputs in valid_inputs], counts)
+    stop_loss = np.repeat([inputs[1] for inputs in valid_inputs], counts)
+    leverage = np.repeat([inputs[3] for inputs in valid_inputs], counts)
+    risk = np.fromiter((risk for inputs in valid_inputs for risk in inputs[2]), dtype=np.float64, count=int(counts.sum()))
+
+    with np.errstate(over="ignore"):
+        results = calculate_position_sizes(capital, stop_loss, risk, leverage)
+    # Finite inputs can still overflow (a huge capital over a tiny stop);
+    # such requests are rejected rather than answered with Infinity.
+    non_finite = ~np.logical_and.reduce([np.isfinite(values) for values in results])
+    overflowed = np.add.reduceat(non_finite, np.concatenate(([0], np.cumsum(counts)[:-1]))) > 0
+    dollar_risk, position_size, margin_required = (values.tolist() for values in results)
+
+    start = 0
+    for position, inputs, count, overflow in zip(valid_positions, valid_inputs, counts.tolist(), overflowed.tolist()):
+        end = start + count
+        if overflow:
+            responses[position] = {"error": NOT_A_NUMBER_ERROR}
+            start = end
+            continue
+        responses[position] = {
+            "risk_levels": inputs[2],
+            "dollar_risk": dollar_risk[start:end],
+            "position_size": position_size[start:end],
+            "margin_required": margin_required[start:end],
+        }
+        start = end
+
+    return responses
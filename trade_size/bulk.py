@@ -0,0 +1,116 @@
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence, Tuple
+
+from .engine import calculate_position_sizes
+from .validation import NOT_A_NUMBER_ERROR, validate_inputs_batch
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CAPITAL_COLUMN = "capital"
+STOP_LOSS_COLUMN = "stop_loss_percentage"
+RISK_COLUMN = "risk_percentage"
+LEVERAGE_COLUMN = "leverage"
+ERROR_COLUMN = "error"
+
+REQUIRED_COLUMNS = (CAPITAL_COLUMN, STOP_LOSS_COLUMN, RISK_COLUMN)
+NUMERIC_COLUMNS = REQUIRED_COLUMNS + (LEVERAGE_COLUMN,)
+RESULT_COLUMNS = ("dollar_risk", "position_size", "margin_required")
+
+def size_frame(frame: "pd.DataFrame") -> Tuple["pd.DataFrame", "pd.DataFrame"]:
+    import numpy as np
+    import pandas as pd
+
+    capital = pd.to_numeric(frame[CAPITAL_COLUMN], errors="coerce").to_numpy(dtype="float64")
+    stop_loss = pd.to_numeric(frame[STOP_LOSS_COLUMN], errors="coerce").to_numpy(dtype="float64")
+    risk = pd.to_numeric(frame[RISK_COLUMN], errors="coerce").to_numpy(dtype="float64")
+    if LEVERAGE_COLUMN in frame:
+        leverage = pd.to_numeric(frame[LEVERAGE_COLUMN], errors="coerce").to_numpy(dtype="float64")
+    else:
+        leverage = pd.Series(1.0, index=frame.index).to_numpy()
+
+    errors = validate_inputs_batch(capital, stop_loss, risk, leverage)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        results = calculate_position_sizes(capital, stop_loss, risk, leverage)
+    # Finite inputs can still overflow (a huge capital over a tiny stop).
+    overflow = pd.isna(errors) & ~np.logical_and.reduce([np.isfinite(values) for values in results])
+    errors[overflow] = NOT_A_NUMBER_ERROR
+    rejected_mask = pd.notna(errors)
+    accepted_mask = ~rejected_mask
+
+    rejected = frame.loc[rejected_mask].copy()
+    rejected[ERROR_COLUMN] = errors[rejected_mask]
+
+    accepted = frame.loc[accepted_mask].copy()
+    for column, values in zip(RESULT_COLUMNS, results):
+        accepted[column] = values[accepted_mask]
+
+    return accepted, rejected
+
+def read_chunks(path: str, chunk_size: int) -> Iterator["pd.DataFrame"]:
+    if path.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+# Parquet needs one schema for the whole file, but pandas infers dtypes per
+# chunk (int64 in one, float64 or object in the next). Known columns are
+# pinned: numeric ones to float64 and, in rejects, raw inputs to strings.
+class ChunkWriter:
+    def __init__(self, path: str, numeric_columns: Sequence[str] = (), text_columns: Sequence[str] = ()):
+        self.path = path
+        self.numeric_columns = tuple(numeric_columns)
+        self.text_columns = tuple(text_columns)
+        self.rows_written = 0
+        self._parquet = path.lower().endswith(".parquet")
+        self._handle = None
+
+    def write(self, frame: "pd.DataFrame") -> None:
+        if self._parquet:
+            self._write_parquet(frame)
+        else:
+            self._write_csv(frame)
+        self.rows_written += len(frame)
+
+    def _write_csv(self, frame: "pd.DataFrame") -> None:
+        header = self._handle is None
+        if header:
+            self._handle = open(self.path, "w", newline="", encoding="utf-8")
+        frame.to_csv(self._handle, header=header, index=False)
+
+    def _pin_dtypes(self, frame: "pd.DataFrame") -> "pd.DataFrame":
+        import pandas as pd
+
+        frame = frame.copy()
+        for column in self.numeric_columns:
+            if column in frame:
+                frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("float64")
+        for column in self.text_columns:
+            if column in frame:
+                frame[column] = frame[column].astype("string")
+        return frame
+
+    def _write_parquet(self, frame: "pd.DataFrame") -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        frame = self._pin_dtypes(frame)
+        if self._handle is None:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            self._handle = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = pa.Table.from_pandas(frame, schema=self._handle.schema, preserve_index=False)
+        self._handle.write_table(table)
+
+    def close(self, empty_columns: Optional[list] = None) -> None:
+        if self._handle is None and empty_columns is not None:
+            import pandas as pd
+
+            self.write(pd.DataFrame(columns=empty_columns))
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
@@ -0,0 +1,157 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .grid import RiskGrid
+from .incremental import IncrementalSizer
+from .table import create_risk_management_table
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_MISSING = object()
+
+TABLE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Rough per-column cost of a label such as "0.25%" (str object + index slot).
+_LABEL_BYTES = 64
+
+# Entries are bounded by count and, when a sizeof function is given, by
+# their approximate total size; a value larger than max_bytes is not stored.
+class LRUCache:
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl_seconds: Optional[float] = 3600.0,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        if maxsize < 1:
+            raise ValueError("اندازه کش باید حداقل ۱ باشد.")
+
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.skipped = 0
+        self.nbytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pop(self, key: Hashable) -> None:
+        self.nbytes -= self._entries.pop(key)[2]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            stored_at, value, _ = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                self._pop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                self.skipped += 1
+                return
+
+            self._entries[key] = (time.monotonic(), value, size)
+            self.nbytes += size
+            while len(self._entries) > self.maxsize or (self.max_bytes is not None and self.nbytes > self.max_bytes):
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "skipped": self.skipped,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def _exact(value: float) -> float:
+    return float(value) + 0.0
+
+def table_cache_key(
+    capital: float,
+    stop_loss_percentage: float,
+    risk_levels: List[float],
+    leverage: float
+) -> Tuple:
+    import numpy as np
+
+    # Exact values: column labels are built from the inputs, so two inputs
+    # may share a frame only if they are the same floats. The ladder goes
+    # in as a digest so the key stays small for million-level ladders.
+    risk = np.ascontiguousarray(risk_levels, dtype=np.float64) + 0.0
+    return (
+        _exact(capital),
+        _exact(stop_loss_percentage),
+        len(risk),
+        hashlib.blake2b(risk.tobytes(), digest_size=16).digest(),
+        _exact(leverage),
+    )
+
+def table_nbytes(df: "pd.DataFrame") -> int:
+    # Tables are a single float64 block, so to_numpy() is a view; this stays
+    # O(1) where memory_usage() loops over the columns in Python.
+    return int(df.to_numpy().nbytes) + _LABEL_BYTES * (df.shape[0] + df.shape[1])
+
+table_cache = LRUCache(max_bytes=TABLE_CACHE_MAX_BYTES, sizeof=table_nbytes)
+
+def cached_risk_management_table(
+    capital: float,
+    stop_loss_percentage: float,
+    risk_levels: List[float],
+    leverage: float = 1.0,
+    cache: LRUCache = table_cache,
+    sizer: Optional[IncrementalSizer] = None,
+    grid: Optional[RiskGrid] = None
+) -> Tuple[Optional["pd.DataFrame"], Optional[str]]:
+    key = table_cache_key(capital, stop_loss_percentage, risk_levels, leverage)
+    df = cache.get(key)
+    if df is None:
+        df, error = create_risk_management_table(
+            capital, stop_loss_percentage, risk_levels, leverage, sizer, grid
+        )
+        if error:
+            return None, error
+        cache.set(key, df)
+
+    # Cached frames are shared by every session; hand out copies.
+    return df.copy(), None
@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from .atr import DEFAULT_ATR_MULTIPLIER, DEFAULT_ATR_PERIOD, PRICE_COLUMNS, ATRState, add_atr_stops, bind_symbol
+from .bulk import (
+    ERROR_COLUMN,
+    NUMERIC_COLUMNS,
+    REQUIRED_COLUMNS,
+    RESULT_COLUMNS,
+    STOP_LOSS_COLUMN,
+    ChunkWriter,
+    read_chunks,
+    size_frame,
+)
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m trade_size",
+        description="محاسبه گروهی سایز پوزیشن برای فایل CSV یا Parquet (هر ردیف یک نماد)."
+    )
+    parser.add_argument("input", help="فایل ورودی (.csv یا .parquet)")
+    parser.add_argument("output", help="فایل خروجی نتایج (.csv یا .parquet)")
+    parser.add_argument(
+        "--rejects",
+        help="فایل ردیف‌های نامعتبر (پیش‌فرض: <output>.rejects.csv)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"تعداد ردیف در هر بخش (پیش‌فرض: {DEFAULT_CHUNK_SIZE})"
+    )
+    parser.add_argument(
+        "--atr-period",
+        type=int,
+        help=(
+            "حد ضرر هر ردیف از ATR با این دوره روی ستون‌های high/low/close محاسبه شود؛ "
+            "ردیف‌ها باید کندل‌های پشت‌سرهم یک نماد باشند (ستون symbol در صورت وجود بررسی می‌شود)"
+        )
+    )
+    parser.add_argument(
+        "--atr-multiplier",
+        type=float,
+        default=DEFAULT_ATR_MULTIPLIER,
+        help=f"ضریب ATR برای فاصله حد ضرر (پیش‌فرض: {DEFAULT_ATR_MULTIPLIER})"
+    )
+    parser.add_argument(
+        "--atr-state",
+        help="فایل JSON وضعیت ATR؛ در صورت وجود ادامه داده و در پایان به‌روزرسانی می‌شود"
+    )
+    return parser
+
+def load_atr_state(path: Optional[str], period: int) -> ATRState:
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as handle:
+            return ATRState.from_dict(json.load(handle))
+    return ATRState(period)
+
+def run(
+    input_path: str,
+    output_path: str,
+    rejects_path: str,
+    chunk_size: int,
+    atr_state: Optional[ATRState] = None,
+    atr_multiplier: float = DEFAULT_ATR_MULTIPLIER
+) -> int:
+    input_columns: List[str] = []
+    required = list(REQUIRED_COLUMNS)
+    numeric = list(NUMERIC_COLUMNS)
+    if atr_state is not None:
+        required = [column for column in required if column != STOP_LOSS_COLUMN] + list(PRICE_COLUMNS)
+        numeric += list(PRICE_COLUMNS)
+
+    results = ChunkWriter(output_path, numeric_columns=numeric + list(RESULT_COLUMNS))
+    rejects = ChunkWriter(rejects_path, text_columns=numeric + [ERROR_COLUMN])
+
+    try:
+        for chunk in read_chunks(input_path, chunk_size):
+            if not input_columns:
+                input_columns = list(chunk.columns)
+                missing = [column for column in required if column not in chunk.columns]
+                if missing:
+                    print(f"❌ ستون‌های لازم در فایل ورودی نیستند: {', '.join(missing)}", file=sys.stderr)
+                    return 2
+
+            if atr_state is not None:
+                # One state runs across all chunks, as over a single series.
+                error = bind_symbol(atr_state, chunk)
+                if error:
+                    print(f"❌ {error}", file=sys.stderr)
+                    return 2
+                chunk = add_atr_stops(chunk, atr_state, atr_multiplier)
+                if STOP_LOSS_COLUMN not in input_columns:
+                    input_columns.append(STOP_LOSS_COLUMN)
+
+            accepted, rejected = size_frame(chunk)
+            if len(accepted):
+                results.write(accepted)
+            if len(rejected):
+                rejects.write(rejected)
+
+        results.close(empty_columns=input_columns + list(RESULT_COLUMNS))
+    finally:
+        results.close()
+        rejects.close()
+
+    print(f"✅ {results.rows_written} ردیف محاسبه شد، {rejects.rows_written} ردیف رد شد.")
+    if rejects.rows_written:
+        print(f"⚠️ ردیف‌های نامعتبر (با ستون '{ERROR_COLUMN}') در {rejects_path} ذخیره شدند.")
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.chunk_size <= 0:
+        print("❌ اندازه بخش باید بیشتر از صفر باشد.", file=sys.stderr)
+        return 2
+
+    if args.atr_period is not None and args.atr_period < 1:
+        print("❌ دوره ATR باید حداقل ۱ باشد.", file=sys.stderr)
+        return 2
+
+    atr_state = None
+    if args.atr_period is not None or args.atr_state:
+        try:
+            atr_state = load_atr_state(args.atr_state, args.atr_period or DEFAULT_ATR_PERIOD)
+        except (ValueError, KeyError) as exc:
+            print(f"❌ فایل وضعیت ATR معتبر نیست: {exc}", file=sys.stderr)
+            return 2
+
+    rejects_path = args.rejects or f"{args.output}.rejects.csv"
+    status = run(args.input, args.output, rejects_path, args.chunk_size, atr_state, args.atr_multiplier)
+    if status == 0 and atr_state is not None and args.atr_state:
+        if not atr_state.is_finite():
+            print("❌ وضعیت ATR نامعتبر شد و ذخیره نمی‌شود.", file=sys.stderr)
+            return 1
+        with open(args.atr_state, "w", encoding="utf-8") as handle:
+            json.dump(atr_state.to_dict(), handle)
+    return status
@@ -0,0 +1,158 @@
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from .engine import ENGINE_VERSION
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.environ.get("TRADE_SIZE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "trade_size")),
+    "results.sqlite3"
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Last-access timestamps are only rewritten when older than this, so hot
+# keys do not turn every read into a write.
+ACCESS_RESOLUTION_SECONDS = 60.0
+
+_MISSING = object()
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"cannot hash value of type {type(value).__name__}")
+
+def stable_key(namespace: str, *args: Any, **kwargs: Any) -> str:
+    payload = json.dumps(
+        {"namespace": namespace, "engine": ENGINE_VERSION, "args": args, "kwargs": kwargs},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=_json_default,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# Keyword arguments that do not change the result (such as a worker count)
+# can be left out of the key so every setting shares one entry.
+def _key_kwargs(kwargs: Dict[str, Any], ignore: Sequence[str]) -> Dict[str, Any]:
+    return {name: value for name, value in kwargs.items() if name not in ignore}
+
+class DiskCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            # WAL lets readers in other worker processes proceed while one writes.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str, default: Any = None) -> Any:
+        connection = self._connection()
+        row = connection.execute("SELECT value, accessed FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return default
+
+        value, accessed = row
+        now = time.time()
+        if now - accessed > ACCESS_RESOLUTION_SECONDS:
+            connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return pickle.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now)
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        stale_keys = []
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            stale_keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        connection.executemany("DELETE FROM entries WHERE key = ?", stale_keys)
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, Any]:
+        entries, total = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {"path": self.path, "entries": entries, "bytes": total, "max_bytes": self.max_bytes}
+
+    def memoize(self, namespace: str, ignore: Sequence[str] = ()) -> Callable:
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                key = stable_key(namespace, *args, **_key_kwargs(kwargs, ignore))
+                value = self.get(key, _MISSING)
+                if value is _MISSING:
+                    value = function(*args, **kwargs)
+                    self.set(key, value)
+                return value
+            return wrapper
+        return decorator
+
+_default_cache: Optional[DiskCache] = None
+_default_lock = threading.Lock()
+
+def get_disk_cache() -> DiskCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = DiskCache()
+        return _default_cache
+
+# The shared cache is resolved on every call, so importing a decorated
+# function never opens the cache file.
+def disk_memoize(namespace: str, ignore: Sequence[str] = ()) -> Callable:
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return get_disk_cache().memoize(namespace, ignore)(function)(*args, **kwargs)
+        return wrapper
+    return decorator
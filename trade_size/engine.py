@@ -0,0 +1,55 @@
+from decimal import Decimal
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Bump whenever a change to the sizing math alters results, so persisted
+# caches keyed on it stop serving stale values.
+ENGINE_VERSION = "1"
+
+# Float64 batch results stay within VECTOR_RTOL (relative) of the Decimal
+# path: each output is at most three correctly-rounded float operations.
+VECTOR_RTOL = 1e-12
+
+def calculate_position_sizes(
+    capital,
+    stop_loss_percentage,
+    risk_percentages,
+    leverage=1.0
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    capital = np.asarray(capital, dtype=np.float64)
+    stop_loss_percentage = np.asarray(stop_loss_percentage, dtype=np.float64)
+    risk_percentages = np.asarray(risk_percentages, dtype=np.float64)
+    leverage = np.asarray(leverage, dtype=np.float64)
+
+    capital_at_risk = capital * risk_percentages
+    dollar_risk = capital_at_risk / 100.0
+    position_size = capital_at_risk / stop_loss_percentage
+    margin_required = position_size / leverage
+
+    return dollar_risk, position_size, margin_required
+
+def calculate_position_sizes_decimal(
+    capital: float,
+    stop_loss_percentage: float,
+    risk_levels: List[float],
+    leverage: float = 1.0
+) -> Tuple[List[float], List[float], List[float]]:
+    capital_dec = Decimal(str(capital))
+    sl_factor = Decimal(str(stop_loss_percentage)) / Decimal('100')
+    leverage_dec = Decimal(str(leverage))
+
+    dollar_risks, position_sizes, margins = [], [], []
+    for risk_percent in risk_levels:
+        risk_factor = Decimal(str(risk_percent)) / Decimal('100')
+
+        position_size_dec = (capital_dec * risk_factor) / sl_factor
+
+        dollar_risks.append(float(capital_dec * risk_factor))
+        position_sizes.append(float(position_size_dec))
+        margins.append(float(position_size_dec / leverage_dec))
+
+    return dollar_risks, position_sizes, margins
@@ -0,0 +1,184 @@
+from decimal import (
+    Decimal, ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP
+)
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+FIXED_POINT_SCALE = 10 ** 8
+FIXED_POINT_ROUNDING_MODES = (ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING)
+
+# Inputs are read as the decimal their repr() shows (what Decimal(str(x))
+# sees): digits * 10**-exponent. Arrays find that exponent in float math
+# while the digits stay below 2**50, where the round-trip check is exact.
+_MAX_EXPONENT = 17
+_EXACT_DIGITS = 2 ** 50
+_INT64_LIMIT = 2 ** 63 - 1
+# int64 division: a float estimate of the quotient is off by a few units
+# below 2**53, and the remainder against it is exact modulo 2**64 as long as
+# a few denominators still fit in int64.
+_ESTIMATE_LIMIT = 2 ** 53
+_DENOMINATOR_LIMIT = 2 ** 56
+
+def _divide_rounded(numerator: int, denominator: int, rounding: str) -> int:
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(numerator, denominator)
+    if remainder == 0 or rounding == ROUND_FLOOR:
+        return quotient
+    if rounding == ROUND_CEILING:
+        return quotient + 1
+    toward_zero = quotient + 1 if quotient < 0 else quotient
+    away_from_zero = toward_zero - 1 if quotient < 0 else toward_zero + 1
+    if rounding == ROUND_DOWN:
+        return toward_zero
+    if rounding == ROUND_UP:
+        return away_from_zero
+    twice_remainder = 2 * remainder
+    if twice_remainder != denominator:
+        return quotient + 1 if twice_remainder > denominator else quotient
+    if rounding == ROUND_HALF_UP:
+        return away_from_zero
+    return quotient if quotient % 2 == 0 else quotient + 1
+
+def _decimal_parts(value) -> Tuple[int, int]:
+    text = repr(float(value)) if isinstance(value, (int, float)) else str(value).strip().lower()
+    if 'e' not in text:
+        whole, _, fraction = text.partition('.')
+        return int(whole + fraction), len(fraction)
+
+    negative = text.startswith('-')
+    mantissa, _, exponent = text.lstrip('+-').partition('e')
+    whole, _, fraction = mantissa.partition('.')
+    digits = int((whole or '0') + fraction)
+    return (-digits if negative else digits), len(fraction) - int(exponent or 0)
+
+def _decimal_parts_array(values) -> Tuple["np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    digits = np.zeros(len(values), dtype=np.int64)
+    exponents = np.full(len(values), -1, dtype=np.int64)
+    pending = np.arange(len(values))
+    for exponent in range(_MAX_EXPONENT + 1):
+        if not len(pending):
+            break
+        scaled = np.rint(values[pending] * 10.0 ** exponent)
+        found = (np.abs(scaled) < _EXACT_DIGITS) & (scaled / 10.0 ** exponent == values[pending])
+        digits[pending[found]] = scaled[found].astype(np.int64)
+        exponents[pending[found]] = exponent
+        pending = pending[~found]
+
+    if len(pending):
+        parts = [_decimal_parts(value) for value in values[pending].tolist()]
+        digits = digits.astype(object)
+        digits[pending] = [part[0] for part in parts]
+        exponents[pending] = [part[1] for part in parts]
+    return digits, exponents
+
+def _wrap_int64(value: int) -> int:
+    return (value + 2 ** 63) % 2 ** 64 - 2 ** 63
+
+def _floor_divmod(values: "np.ndarray", numerator: int, denominator: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    # floor(values * numerator / denominator) and its remainder, exactly.
+    if values.dtype != object and denominator < _DENOMINATOR_LIMIT:
+        estimate = np.floor(values * (numerator / denominator))
+        if not len(estimate) or np.abs(estimate).max() < _ESTIMATE_LIMIT:
+            quotient = estimate.astype(np.int64)
+            with np.errstate(over="ignore"):
+                remainder = values * np.int64(_wrap_int64(numerator)) - quotient * np.int64(denominator)
+            correction = remainder // denominator
+            return quotient + correction, remainder - correction * denominator
+
+    products = values.astype(object) * numerator
+    quotient = products // denominator
+    return quotient, products - quotient * denominator
+
+def _divide_rounded_array(values: "np.ndarray", numerator: int, denominator: int, rounding: str) -> "np.ndarray":
+    import numpy as np
+
+    # Same policy as _divide_rounded, element-wise; denominator is positive.
+    quotient, remainder = _floor_divmod(values, numerator, denominator)
+    inexact = remainder != 0
+    if rounding == ROUND_FLOOR:
+        return quotient
+    if rounding == ROUND_CEILING:
+        return quotient + inexact
+    negative = quotient < 0
+    toward_zero = quotient + (inexact & negative)
+    away_from_zero = quotient + (inexact & ~negative)
+    if rounding == ROUND_DOWN:
+        return toward_zero
+    if rounding == ROUND_UP:
+        return away_from_zero
+
+    twice_remainder = remainder * 2
+    result = quotient + (twice_remainder > denominator)
+    tie = twice_remainder == denominator
+    if rounding == ROUND_HALF_UP:
+        tie_result = away_from_zero
+    else:
+        tie_result = quotient + (quotient % 2 != 0)
+    return np.where(tie, tie_result, result)
+
+def to_fixed_point(value, rounding: str = ROUND_HALF_EVEN) -> int:
+    digits, exponent = _decimal_parts(value)
+    shift = 8 - exponent
+    if shift >= 0:
+        return digits * 10 ** shift
+    return _divide_rounded(digits, 10 ** -shift, rounding)
+
+def from_fixed_point(units: int) -> Decimal:
+    return Decimal(units).scaleb(-8)
+
+def calculate_position_sizes_fixed(
+    capital: float,
+    stop_loss_percentage: float,
+    risk_levels: List[float],
+    leverage: float = 1.0,
+    rounding: str = ROUND_HALF_EVEN
+) -> Tuple[List[int], List[int], List[int]]:
+    import numpy as np
+
+    if rounding not in FIXED_POINT_ROUNDING_MODES:
+        raise ValueError(f"روش گرد کردن '{rounding}' پشتیبانی نمی‌شود.")
+
+    capital_digits, capital_exponent = _decimal_parts(capital)
+    sl_digits, sl_exponent = _decimal_parts(stop_loss_percentage)
+    leverage_digits, leverage_exponent = _decimal_parts(leverage)
+    risk_digits, risk_exponents = _decimal_parts_array(risk_levels)
+    if not len(risk_digits):
+        return [], [], []
+
+    # Every output is the exact rational result rounded once to 1e-8 USD.
+    # With C = c/10^kc, R = r/10^kr, SL = s/10^ks, L = l/10^kl, in units:
+    #   risk     = c*r * 10^8 / (100 * 10^(kc+kr))
+    #   position = c*r * 10^(ks+8) / (s * 10^(kc+kr))
+    #   margin   = c*r * 10^(ks+kl+8) / (s*l * 10^(kc+kr))
+    # Scaling numerator and denominator by a common power of ten leaves
+    # every denominator as a constant times 10^(max_kr - kr).
+    max_exponent = int(risk_exponents.max())
+    base = 10 ** (capital_exponent + max_exponent)
+    numerators = (
+        capital_digits * 10 ** 8,
+        capital_digits * 10 ** (sl_exponent + 8),
+        capital_digits * 10 ** (sl_exponent + leverage_exponent + 8),
+    )
+    denominators = (100 * base, sl_digits * base, sl_digits * leverage_digits * base)
+
+    largest_risk = int(np.abs(risk_digits).max()) * 10 ** (max_exponent - int(risk_exponents.min()))
+    dtype = np.int64 if risk_digits.dtype != object and largest_risk <= _INT64_LIMIT else object
+    powers = np.array([10 ** k for k in range(max_exponent + 1)], dtype=dtype)
+    scaled_risk = risk_digits.astype(dtype) * powers[max_exponent - risk_exponents]
+
+    results = []
+    for numerator, denominator in zip(numerators, denominators):
+        if denominator < 0:
+            numerator, denominator = -numerator, -denominator
+        results.append(_divide_rounded_array(scaled_risk, numerator, denominator, rounding).tolist())
+
+    dollar_risks, position_sizes, margins = results
+    return dollar_risks, position_sizes, margins
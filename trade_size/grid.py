@@ -0,0 +1,108 @@
+import functools
+import os
+import struct
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+GRID_ENV_VAR = "TRADE_SIZE_GRID"
+DEFAULT_GRID_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "risk_grid.bin")
+
+STANDARD_RISK_LEVELS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0)
+STOP_LOSS_START = 0.01
+STOP_LOSS_STEP = 0.01
+STOP_LOSS_COUNT = 9999
+
+# Layout (little-endian): magic, stop count, risk count, stop start, stop
+# step, risk values[risk count], then position-per-dollar factors
+# (risk / stop) as a row-major [stop count, risk count] float64 matrix.
+# Sizing is linear in capital and margin is position / leverage, so one
+# factor per (stop, risk) pair answers every capital and leverage exactly.
+_MAGIC = b"TSGRID01"
+_HEADER = struct.Struct("<8sIIdd")
+_GRID_TOLERANCE = 1e-9
+
+class RiskGrid:
+    def __init__(self, stop_start: float, stop_step: float, risk_values: "np.ndarray", factors: "np.ndarray"):
+        self.stop_start = stop_start
+        self.stop_step = stop_step
+        self.risk_values = risk_values
+        self.factors = factors
+        self._risk_keys = risk_values.round(10)
+
+    @classmethod
+    def load(cls, path: str) -> "RiskGrid":
+        import numpy as np
+
+        with open(path, "rb") as handle:
+            magic, stop_count, risk_count, stop_start, stop_step = _HEADER.unpack(handle.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} فایل جدول پیش‌محاسبه معتبر نیست.")
+            risk_values = np.frombuffer(handle.read(8 * risk_count), dtype="<f8").copy()
+
+        factors = np.memmap(
+            path,
+            dtype="<f8",
+            mode="r",
+            offset=_HEADER.size + 8 * risk_count,
+            shape=(stop_count, risk_count)
+        )
+        return cls(stop_start, stop_step, risk_values, factors)
+
+    def _stop_index(self, stop_loss_percentage: float) -> Optional[int]:
+        position = (stop_loss_percentage - self.stop_start) / self.stop_step
+        index = int(round(position))
+        if abs(position - index) > _GRID_TOLERANCE or not 0 <= index < self.factors.shape[0]:
+            return None
+        return index
+
+    def lookup(
+        self,
+        capital: float,
+        stop_loss_percentage: float,
+        risk_levels: Sequence[float],
+        leverage: float = 1.0
+    ) -> Optional[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]]:
+        import numpy as np
+
+        stop_index = self._stop_index(float(stop_loss_percentage))
+        if stop_index is None:
+            return None
+
+        keys = np.round(np.asarray(risk_levels, dtype=np.float64), 10)
+        risk_indices = np.searchsorted(self._risk_keys, keys)
+        if np.any(risk_indices >= len(self._risk_keys)) or not np.array_equal(self._risk_keys[risk_indices], keys):
+            return None
+
+        risk = self.risk_values[risk_indices]
+        position_size = capital * self.factors[stop_index, risk_indices]
+        return capital * risk / 100.0, position_size, position_size / leverage
+
+def build_grid(
+    path: str,
+    risk_values: Sequence[float] = STANDARD_RISK_LEVELS,
+    stop_start: float = STOP_LOSS_START,
+    stop_step: float = STOP_LOSS_STEP,
+    stop_count: int = STOP_LOSS_COUNT
+) -> None:
+    import numpy as np
+
+    risk = np.asarray(sorted(set(risk_values)), dtype="<f8")
+    stops = np.round(stop_start + stop_step * np.arange(stop_count, dtype=np.float64), 10)
+    factors = (risk[np.newaxis, :] / stops[:, np.newaxis]).astype("<f8")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(_HEADER.pack(_MAGIC, stop_count, len(risk), stop_start, stop_step))
+        handle.write(risk.tobytes())
+        handle.write(np.ascontiguousarray(factors).tobytes())
+    os.replace(temporary, path)
+
+@functools.lru_cache(maxsize=None)
+def load_default_grid() -> Optional[RiskGrid]:
+    path = os.environ.get(GRID_ENV_VAR, DEFAULT_GRID_PATH)
+    if not os.path.exists(path):
+        return None
+    return RiskGrid.load(path)
@@ -0,0 +1,80 @@
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from .engine import calculate_position_sizes
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Dollar risk and position size depend only on capital, stop-loss and the
+# risk level, so they are cached per risk level for the current
+# (capital, stop-loss) pair. Margin is always derived from the cached
+# position size, so a leverage change never recomputes a column.
+class IncrementalSizer:
+    def __init__(self, max_cached_levels: int = 2_000_000):
+        self.max_cached_levels = max_cached_levels
+        self.computed = 0
+        self.reused = 0
+        self._base: Optional[Tuple[float, float]] = None
+        self._risk = None
+        self._dollar_risk = None
+        self._position_size = None
+
+    def size(
+        self,
+        capital: float,
+        stop_loss_percentage: float,
+        risk_levels,
+        leverage: float = 1.0
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        import numpy as np
+
+        risk_levels = np.asarray(risk_levels, dtype=np.float64)
+        base = (float(capital), float(stop_loss_percentage))
+        if base != self._base or self._risk is None:
+            self._base = base
+            self._reset()
+
+        positions = np.searchsorted(self._risk, risk_levels)
+        found = positions < len(self._risk)
+        found[found] = self._risk[positions[found]] == risk_levels[found]
+
+        missing = np.unique(risk_levels[~found])
+        if len(self._risk) + len(missing) > self.max_cached_levels:
+            # Dropping only part of the cache would leave the positions of
+            # the found levels pointing at the wrong slots, so start over.
+            self._reset()
+            found[:] = False
+            missing = np.unique(risk_levels)
+
+        if len(missing) > self.max_cached_levels:
+            self.computed += len(missing)
+            dollar_risk, position_size, _ = calculate_position_sizes(capital, stop_loss_percentage, risk_levels)
+            return dollar_risk, position_size, position_size / float(leverage)
+
+        if len(missing):
+            dollar_risk, position_size, _ = calculate_position_sizes(capital, stop_loss_percentage, missing)
+            self._merge(missing, dollar_risk, position_size)
+            positions = np.searchsorted(self._risk, risk_levels)
+
+        self.computed += len(missing)
+        self.reused += int(found.sum())
+
+        dollar_risk = self._dollar_risk[positions]
+        position_size = self._position_size[positions]
+        return dollar_risk, position_size, position_size / float(leverage)
+
+    def _reset(self) -> None:
+        import numpy as np
+
+        self._risk = np.empty(0, dtype=np.float64)
+        self._dollar_risk = np.empty(0, dtype=np.float64)
+        self._position_size = np.empty(0, dtype=np.float64)
+
+    def _merge(self, risk, dollar_risk, position_size) -> None:
+        import numpy as np
+
+        merged_risk = np.concatenate([self._risk, risk])
+        order = np.argsort(merged_risk, kind="stable")
+        self._risk = merged_risk[order]
+        self._dollar_risk = np.concatenate([self._dollar_risk, dollar_risk])[order]
+        self._position_size = np.concatenate([self._position_size, position_size])[order]
@@ -0,0 +1,116 @@
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+R_MULTIPLE_COLUMNS = ("r_multiple", "r", "R", "r_multiples")
+PNL_COLUMNS = ("pnl", "PnL", "profit", "net_pnl")
+KELLY_FRACTIONS = {"Kelly": 1.0, "½ Kelly": 0.5, "¼ Kelly": 0.25}
+
+GROWTH_GRID_POINTS = 1_000
+HISTOGRAM_BINS = 4_096
+NEWTON_ITERATIONS = 50
+
+class SizingEstimate(NamedTuple):
+    trades: int
+    win_rate: float
+    payoff_ratio: float
+    kelly_fraction: float
+    average_loss: float
+    optimal_f: float
+    optimal_risk_fraction: float
+    growth_fractions: "np.ndarray"
+    growth_rates: "np.ndarray"
+
+    def risk_percentages(self) -> Dict[str, float]:
+        # Kelly's fraction is what an average loss may cost, and an average
+        # loss is average_loss R, so risk per 1R is the fraction divided by it.
+        risk_fraction = self.kelly_fraction / self.average_loss
+        percentages = {name: risk_fraction * share * 100.0 for name, share in KELLY_FRACTIONS.items()}
+        percentages["Optimal f"] = self.optimal_risk_fraction * 100.0
+        return percentages
+
+def load_trade_journal(source, column: Optional[str] = None) -> Tuple["np.ndarray", str]:
+    import pandas as pd
+
+    name = getattr(source, "name", source)
+    if str(name).lower().endswith(".parquet"):
+        frame = pd.read_parquet(source, columns=[column] if column else None)
+    else:
+        frame = pd.read_csv(source, usecols=[column] if column else None)
+
+    if column is None:
+        candidates = [c for c in R_MULTIPLE_COLUMNS + PNL_COLUMNS if c in frame.columns]
+        if not candidates:
+            raise ValueError(
+                f"ستون R یا PnL پیدا نشد. یکی از این ستون‌ها لازم است: {', '.join(R_MULTIPLE_COLUMNS + PNL_COLUMNS)}"
+            )
+        column = candidates[0]
+
+    values = pd.to_numeric(frame[column], errors="coerce").dropna().to_numpy(dtype="float64")
+    kind = "r" if column in R_MULTIPLE_COLUMNS else "pnl"
+    return values, kind
+
+def to_r_multiples(pnl: "np.ndarray") -> "np.ndarray":
+    losses = pnl[pnl < 0]
+    if not len(losses):
+        raise ValueError("ژورنال باید حداقل یک معامله زیان‌ده داشته باشد.")
+    # Without a recorded per-trade risk, 1R is taken as the average loss.
+    return pnl / -losses.mean()
+
+def _histogram(values: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+    sums, _ = np.histogram(values, bins=edges, weights=values)
+    occupied = counts > 0
+    return sums[occupied] / counts[occupied], counts[occupied] / len(values)
+
+def estimate_sizing(r_multiples: "np.ndarray") -> SizingEstimate:
+    import numpy as np
+
+    r_multiples = np.asarray(r_multiples, dtype=np.float64)
+    wins, losses = r_multiples[r_multiples > 0], r_multiples[r_multiples < 0]
+    if not len(wins) or not len(losses):
+        raise ValueError("ژورنال باید هم معامله سودده و هم زیان‌ده داشته باشد.")
+
+    win_rate = len(wins) / len(r_multiples)
+    average_loss = float(-losses.mean())
+    payoff_ratio = float(wins.mean()) / average_loss
+    kelly_fraction = max(0.0, win_rate - (1.0 - win_rate) / payoff_ratio)
+
+    # Growth G(p) = mean(log(1 + p*R)) is defined for p < 1/|worst R|.
+    worst_loss = -losses.min()
+    max_fraction = 1.0 / worst_loss
+    fractions = np.linspace(0.0, max_fraction, GROWTH_GRID_POINTS, endpoint=False)[1:]
+
+    # The curve is drawn from a weighted histogram of the trades, so the whole
+    # fraction grid is one (grid x bins) matrix regardless of journal size.
+    centers, weights = _histogram(r_multiples)
+    growth_rates = np.log1p(fractions[:, np.newaxis] * centers[np.newaxis, :]) @ weights
+
+    # The peak is then refined exactly on the raw trades: G is concave, so
+    # Newton steps on G'(p) = mean(R / (1 + pR)) converge from the grid peak.
+    fraction = fractions[int(np.argmax(growth_rates))]
+    for _ in range(NEWTON_ITERATIONS):
+        denominator = 1.0 + fraction * r_multiples
+        gradient = np.mean(r_multiples / denominator)
+        curvature = -np.mean((r_multiples / denominator) ** 2)
+        step = gradient / curvature
+        fraction = min(max(fraction - step, 0.0), max_fraction * (1 - 1e-9))
+        if abs(step) < 1e-12:
+            break
+    if np.mean(r_multiples) <= 0:
+        fraction = 0.0
+
+    return SizingEstimate(
+        trades=len(r_multiples),
+        win_rate=win_rate,
+        payoff_ratio=payoff_ratio,
+        kelly_fraction=kelly_fraction,
+        average_loss=average_loss,
+        optimal_f=float(fraction * worst_loss),
+        optimal_risk_fraction=float(fraction),
+        growth_fractions=fractions,
+        growth_rates=growth_rates,
+    )
@@ -0,0 +1,116 @@
+import functools
+import json
+import os
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from .engine import calculate_position_sizes
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+BRACKETS_ENV_VAR = "TRADE_SIZE_BRACKETS"
+DEFAULT_BRACKETS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "brackets.json")
+
+LONG = "long"
+SHORT = "short"
+ISOLATED = "isolated"
+CROSS = "cross"
+
+# Each bracket's maintenance amount ("cum") is derived from the ones below
+# it, so maintenance margin N * rate - cum is continuous across brackets.
+class BracketTable:
+    def __init__(self, notional_caps: "np.ndarray", rates: "np.ndarray", max_leverage: "np.ndarray"):
+        import numpy as np
+
+        self.notional_caps = notional_caps
+        self.rates = rates
+        self.max_leverage = max_leverage
+        floors = np.concatenate(([0.0], notional_caps[:-1]))
+        self.amounts = np.cumsum(floors * np.diff(rates, prepend=rates[0]))
+
+    @classmethod
+    def from_brackets(cls, brackets: List[Dict]) -> "BracketTable":
+        import numpy as np
+
+        caps = np.array([np.inf if b["notional_cap"] is None else b["notional_cap"] for b in brackets], dtype=np.float64)
+        rates = np.array([b["maintenance_margin_rate"] for b in brackets], dtype=np.float64)
+        max_leverage = np.array([b["max_leverage"] for b in brackets], dtype=np.float64)
+        if not len(caps) or np.any(np.diff(caps) <= 0) or np.any(np.diff(rates) < 0):
+            raise ValueError("پله‌های مارجین باید سقف صعودی و نرخ غیرنزولی داشته باشند.")
+        return cls(caps, rates, max_leverage)
+
+    def lookup(self, notional) -> "np.ndarray":
+        import numpy as np
+
+        # Bracket i covers (cap[i-1], cap[i]]; len(caps) means above the last cap.
+        return np.searchsorted(self.notional_caps, np.asarray(notional, dtype=np.float64), side="left")
+
+def load_brackets(path: str) -> Dict[str, BracketTable]:
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    return {symbol: BracketTable.from_brackets(brackets) for symbol, brackets in data.items()}
+
+@functools.lru_cache(maxsize=None)
+def load_default_brackets() -> Dict[str, BracketTable]:
+    path = os.environ.get(BRACKETS_ENV_VAR, DEFAULT_BRACKETS_PATH)
+    if not os.path.exists(path):
+        return {}
+    return load_brackets(path)
+
+def liquidation_distances(
+    capital: float,
+    position_sizes,
+    leverage: float,
+    brackets: BracketTable,
+    side: str = LONG,
+    margin_mode: str = ISOLATED
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    notional = np.asarray(position_sizes, dtype=np.float64)
+    index = brackets.lookup(notional)
+    over_limit = index >= len(brackets.notional_caps)
+    index = np.minimum(index, len(brackets.notional_caps) - 1)
+    rate = brackets.rates[index]
+    amount = brackets.amounts[index]
+
+    # Liquidation is where margin + PnL meets maintenance margin; as a
+    # fraction of the entry price, with margin = N / L (isolated) or the
+    # whole capital (cross, this position only):
+    #   long:  (1 - margin / N - cum / N) / (1 - rate)
+    #   short: (1 + margin / N + cum / N) / (1 + rate)
+    margin = notional / leverage if margin_mode == ISOLATED else np.full_like(notional, float(capital))
+    buffer = (margin + amount) / notional
+    if side == LONG:
+        distance = 1.0 - np.maximum((1.0 - buffer) / (1.0 - rate), 0.0)
+    else:
+        distance = (1.0 + buffer) / (1.0 + rate) - 1.0
+
+    distance = np.clip(distance * 100.0, 0.0, None)
+    distance[over_limit] = np.nan
+    rejected = over_limit | (leverage > brackets.max_leverage[index])
+    return distance, rate * 100.0, rejected
+
+def liquidation_report(
+    capital: float,
+    stop_loss_percentage: float,
+    risk_levels: List[float],
+    leverage: float,
+    brackets: BracketTable,
+    side: str = LONG,
+    margin_mode: str = ISOLATED
+) -> Tuple["pd.DataFrame", "np.ndarray", "np.ndarray"]:
+    import pandas as pd
+
+    _, position_size, _ = calculate_position_sizes(capital, stop_loss_percentage, risk_levels, leverage)
+    distance, rate, rejected = liquidation_distances(capital, position_size, leverage, brackets, side, margin_mode)
+    # A stop at or past liquidation is never reached; NaN (no bracket) is flagged too.
+    stop_past_liquidation = ~(distance > stop_loss_percentage)
+
+    report = pd.DataFrame(
+        [distance, rate],
+        index=['🔥 فاصله تا لیکوئید (٪)', '🧾 نرخ مارجین نگهداری (٪)'],
+        columns=[f"{risk_percent}%" for risk_percent in risk_levels]
+    )
+    return report, stop_past_liquidation, rejected
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from .batch import size_requests
+
+class MicroBatcher:
+    def __init__(self, max_batch_size: int = 256, max_wait_us: int = 200):
+        if max_batch_size < 1:
+            raise ValueError("اندازه دسته باید حداقل ۱ باشد.")
+        if max_wait_us < 0:
+            raise ValueError("حداکثر زمان انتظار نمی‌تواند منفی باشد.")
+
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1_000_000
+        self.batches = 0
+        self.requests = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._futures: List[asyncio.Future] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def size(
+        self,
+        capital: float,
+        stop_loss_percentage: float,
+        risk_levels: List[float],
+        leverage: float = 1.0
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append({
+            "capital": capital,
+            "stop_loss_percentage": stop_loss_percentage,
+            "risk_levels": list(risk_levels),
+            "leverage": leverage,
+        })
+        self._futures.append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        pending, futures = self._pending, self._futures
+        self._pending, self._futures = [], []
+        self.batches += 1
+        self.requests += len(pending)
+
+        try:
+            responses = size_requests(pending)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, response in zip(futures, responses):
+            if not future.done():
+                future.set_result(response)
+
+    async def __aenter__(self) -> "MicroBatcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.flush()
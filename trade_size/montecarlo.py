@@ -0,0 +1,101 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Paths are simulated in fixed-size shards, each with its own child seed, so
+# results depend only on the seed - never on how many workers ran them.
+SHARD_PATHS = 2_000
+# Spawning a process pool costs about half a second, so smaller runs
+# (paths x trades below this) stay in-process whatever workers says.
+PARALLEL_MIN_STEPS = 20_000_000
+MAX_MATRIX_ELEMENTS = 4_000_000
+DEFAULT_QUANTILES = (5, 25, 50, 75, 95)
+
+def _simulate_shard(
+    seed_sequence: "np.random.SeedSequence",
+    paths: int,
+    fractions: "np.ndarray",
+    win_rate: float,
+    reward_risk: float,
+    trades: int,
+    ruin_equity: float
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    rng = np.random.default_rng(seed_sequence)
+    max_drawdown = np.empty((len(fractions), paths))
+    terminal = np.empty((len(fractions), paths))
+    ruined = np.zeros(len(fractions), dtype=np.int64)
+
+    chunk = max(1, MAX_MATRIX_ELEMENTS // trades)
+    for start in range(0, paths, chunk):
+        stop = min(start + chunk, paths)
+        # The same win/loss sequence is replayed at every risk level, so the
+        # levels are compared on identical trade histories.
+        wins = rng.random((stop - start, trades)) < win_rate
+        for level, fraction in enumerate(fractions):
+            growth = np.where(wins, 1.0 + fraction * reward_risk, 1.0 - fraction)
+            equity = np.cumprod(growth, axis=1)
+            peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+            drawdown = 1.0 - equity / peak
+
+            max_drawdown[level, start:stop] = drawdown.max(axis=1)
+            terminal[level, start:stop] = equity[:, -1]
+            ruined[level] += int((equity.min(axis=1) <= ruin_equity).sum())
+
+    return max_drawdown, terminal, ruined
+
+def simulate_equity(
+    risk_levels: Sequence[float],
+    win_rate: float,
+    reward_risk: float,
+    trades: int,
+    paths: int,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    ruin_drawdown_percentage: float = 50.0,
+    quantiles: Sequence[int] = DEFAULT_QUANTILES
+) -> "pd.DataFrame":
+    import numpy as np
+    import pandas as pd
+
+    if not 0 <= win_rate <= 1:
+        raise ValueError("نرخ برد باید بین ۰ و ۱ باشد.")
+    if reward_risk <= 0 or trades < 1 or paths < 1:
+        raise ValueError("نسبت سود به ضرر، تعداد معاملات و تعداد مسیرها باید مثبت باشند.")
+
+    fractions = np.asarray(risk_levels, dtype=np.float64) / 100.0
+    ruin_equity = 1.0 - ruin_drawdown_percentage / 100.0
+
+    shard_sizes = [min(SHARD_PATHS, paths - start) for start in range(0, paths, SHARD_PATHS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(shard_sizes))
+    arguments = [
+        (shard_seed, size, fractions, win_rate, reward_risk, trades, ruin_equity)
+        for shard_seed, size in zip(seeds, shard_sizes)
+    ]
+
+    if workers > 1 and len(arguments) > 1 and paths * trades >= PARALLEL_MIN_STEPS:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            shards = list(executor.map(_simulate_shard, *zip(*arguments)))
+    else:
+        shards = [_simulate_shard(*shard_arguments) for shard_arguments in arguments]
+
+    max_drawdown = np.concatenate([shard[0] for shard in shards], axis=1) * 100.0
+    terminal = np.concatenate([shard[1] for shard in shards], axis=1)
+    ruined = np.sum([shard[2] for shard in shards], axis=0)
+
+    result = {
+        "احتمال ورشکستگی (٪)": ruined / paths * 100.0,
+        "میانه افت سرمایه (٪)": np.median(max_drawdown, axis=1),
+        "افت سرمایه صدک ۹۵ (٪)": np.percentile(max_drawdown, 95, axis=1),
+    }
+    terminal_quantiles = np.percentile(terminal, quantiles, axis=1)
+    for q, values in zip(quantiles, terminal_quantiles):
+        result[f"سرمایه نهایی صدک {q} (×)"] = values
+
+    return pd.DataFrame(result, index=pd.Index([f"{risk}%" for risk in risk_levels], name="سطح ریسک"))
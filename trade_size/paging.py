@@ -0,0 +1,36 @@
+from typing import TYPE_CHECKING, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+Bounds = Tuple[Optional[float], Optional[float]]
+
+def select_rows(
+    columns: Mapping[str, "np.ndarray"],
+    sort_by: Optional[str] = None,
+    descending: bool = False,
+    bounds: Optional[Mapping[str, Bounds]] = None
+) -> "np.ndarray":
+    import numpy as np
+
+    length = len(next(iter(columns.values())))
+    mask = np.ones(length, dtype=bool)
+    for name, (lower, upper) in (bounds or {}).items():
+        if lower is not None:
+            mask &= columns[name] >= lower
+        if upper is not None:
+            mask &= columns[name] <= upper
+
+    rows = np.flatnonzero(mask)
+    if sort_by is not None:
+        order = np.argsort(columns[sort_by][rows], kind="stable")
+        rows = rows[order[::-1] if descending else order]
+    return rows
+
+def page_count(total: int, page_size: int) -> int:
+    return max(1, -(-total // page_size))
+
+def page_rows(rows: "np.ndarray", page: int, page_size: int) -> "np.ndarray":
+    page = min(max(page, 1), page_count(len(rows), page_size))
+    start = (page - 1) * page_size
+    return rows[start:start + page_size]
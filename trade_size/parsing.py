@@ -0,0 +1,143 @@
+import math
+import re
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAX_RISK_LEVELS = 1_000_000
+MAX_INPUT_LENGTH = 20_000
+
+# Every pattern below is unambiguous (no two quantifiers can claim the same
+# characters), so matching is linear in the token length even on failure.
+_NUMBER = r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?"
+_TOKEN_RE = re.compile(r"[^,،]+")
+_PLAIN_RE = re.compile(_NUMBER)
+_RANGE_RE = re.compile(rf"({_NUMBER})\s*:\s*({_NUMBER})\s*:\s*({_NUMBER})")
+_GEOMETRIC_RE = re.compile(rf"({_NUMBER})\s*\*\s*({_NUMBER})\s*\^\s*([-+]?\d+)\s*\.\.\s*([-+]?\d+)")
+
+# Expanded values are rounded to this many significant digits so 0.1-style
+# steps do not leak float noise (0.30000000000000004) into column names.
+# The rounding is relative, so tiny ladder values (1e-14) survive.
+_RANGE_SIGNIFICANT_DIGITS = 12
+
+def _preview(token: str, limit: int = 24) -> str:
+    return token if len(token) <= limit else token[:limit] + "…"
+
+def _parse_range(part: str) -> Tuple[Optional[tuple], Optional[str]]:
+    match = _RANGE_RE.fullmatch(part)
+    if not match:
+        return None, f"بازه '{_preview(part)}' معتبر نیست. قالب درست: شروع:پایان:گام (مثلاً 0.25:3:0.25)"
+
+    start, stop, step = (float(value) for value in match.groups())
+    if step <= 0:
+        return None, f"گام بازه '{_preview(part)}' باید بیشتر از صفر باشد."
+    if stop < start:
+        return None, f"در بازه '{_preview(part)}' مقدار پایان باید بزرگ‌تر یا مساوی شروع باشد."
+
+    steps = (stop - start) / step
+    if not math.isfinite(steps) or steps >= MAX_RISK_LEVELS:
+        return ("range", start, step, MAX_RISK_LEVELS + 1), None
+
+    count = math.floor(steps + 1e-9) + 1
+    return ("range", start, step, count), None
+
+def _parse_geometric(part: str) -> Tuple[Optional[tuple], Optional[str]]:
+    match = _GEOMETRIC_RE.fullmatch(part)
+    if not match:
+        return None, f"نردبان '{_preview(part)}' معتبر نیست. قالب درست: پایه*ضریب^شروع..پایان (مثلاً 0.1*2^0..6)"
+
+    base, ratio = float(match.group(1)), float(match.group(2))
+    first, last = int(match.group(3)), int(match.group(4))
+    if ratio <= 0:
+        return None, f"ضریب نردبان '{_preview(part)}' باید بیشتر از صفر باشد."
+    if last < first:
+        return None, f"در نردبان '{_preview(part)}' توان پایانی باید بزرگ‌تر یا مساوی توان شروع باشد."
+
+    return ("geometric", base, ratio, first, last - first + 1), None
+
+def _round_significant(values: "np.ndarray", digits: int = _RANGE_SIGNIFICANT_DIGITS) -> "np.ndarray":
+    import numpy as np
+
+    with np.errstate(divide="ignore"):
+        magnitude = np.floor(np.log10(np.abs(values)))
+    exponent = np.where(np.isfinite(magnitude), digits - 1 - magnitude, 0.0)
+    # Powers of ten are exact up to 1e22, so scaling by one (up or down) and
+    # rounding gives the nearest float to the rounded decimal.
+    exact = np.abs(exponent) <= 22
+    scale = 10.0 ** np.where(exact, np.abs(exponent), 0.0)
+    scaled_up = exponent >= 0
+    result = np.where(
+        scaled_up,
+        np.round(values * scale) / scale,
+        np.round(values / scale) * scale,
+    )
+    # Values below ~1e-11 (or absurdly large ones) go through repr.
+    for index in np.flatnonzero(~exact):
+        result[index] = float(f"{values[index]:.{digits}g}")
+    return result
+
+def _expand(values: List[float], generators: List[tuple]) -> "np.ndarray":
+    import numpy as np
+
+    segments = []
+    for generator in generators:
+        if generator[0] == "range":
+            _, start, step, count = generator
+            segments.append(start + step * np.arange(count, dtype=np.float64))
+        else:
+            _, base, ratio, first, count = generator
+            exponents = np.arange(first, first + count, dtype=np.float64)
+            segments.append(base * np.power(ratio, exponents))
+
+    # Generated values are rounded in one pass; plain values are kept as typed.
+    generated = _round_significant(np.concatenate(segments)) if segments else np.empty(0)
+    return np.unique(np.concatenate((np.asarray(values, dtype=np.float64), generated)))
+
+def _tokenize(risk_input: str) -> Iterator[Tuple[int, str]]:
+    for match in _TOKEN_RE.finditer(risk_input):
+        token = match.group()
+        stripped = token.lstrip()
+        if stripped.strip():
+            yield match.start() + len(token) - len(stripped) + 1, stripped.rstrip()
+
+def parse_risk_levels(risk_input: str) -> Tuple[Optional["np.ndarray"], Optional[str]]:
+    if not risk_input or not risk_input.strip():
+        return None, "لطفاً سطوح ریسک را وارد کنید."
+    
+    if len(risk_input) > MAX_INPUT_LENGTH:
+        return None, f"ورودی سطوح ریسک نمی‌تواند بیشتر از {MAX_INPUT_LENGTH:,} کاراکتر باشد."
+    
+    try:
+        risk_levels = []
+        generators = []
+        bad_tokens = []
+        expanded_count = 0
+        
+        for position, part in _tokenize(risk_input):
+            if ':' in part or '^' in part:
+                generator, error = _parse_range(part) if ':' in part else _parse_geometric(part)
+                if error:
+                    bad_tokens.append(f"{error} (موقعیت {position})")
+                    continue
+                generators.append(generator)
+                expanded_count += generator[-1]
+            elif _PLAIN_RE.fullmatch(part):
+                risk_levels.append(float(part))
+                expanded_count += 1
+            else:
+                bad_tokens.append(f"مقدار '{_preview(part)}' در موقعیت {position} معتبر نیست.")
+        
+        if bad_tokens:
+            return None, " ".join(bad_tokens) + " لطفاً فقط اعداد، بازه یا نردبان وارد کنید."
+        
+        if expanded_count > MAX_RISK_LEVELS:
+            return None, f"تعداد سطوح ریسک نمی‌تواند بیشتر از {MAX_RISK_LEVELS:,} باشد."
+        
+        if not risk_levels and not generators:
+            return None, "لطفاً حداقل یک سطح ریسک معتبر وارد کنید."
+        
+        return _expand(risk_levels, generators), None
+        
+    except Exception as e:
+        return None, f"خطا در پردازش: {str(e)}"
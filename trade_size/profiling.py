@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, Optional
+
+PROFILE_ENV_VAR = "TRADE_SIZE_PROFILE"
+
+_NULL_SPAN = nullcontext()
+_active_profiler: ContextVar[Optional["Profiler"]] = ContextVar("trade_size_profiler", default=None)
+
+def profiling_requested() -> bool:
+    return os.environ.get(PROFILE_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+class Profiler:
+    def __init__(self, window: int = 200, max_trace_events: int = 50_000):
+        self.runs = 0
+        self.last_run: Dict[str, float] = {}
+        self.last_counts: Dict[str, int] = {}
+        self._history: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._current: Dict[str, float] = defaultdict(float)
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=max_trace_events)
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    @contextmanager
+    def _span(self, name: str) -> Iterator[None]:
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            self._current[name] += elapsed / 1e6
+            self._counts[name] += 1
+            self._events.append({
+                "name": name,
+                "ph": "X",
+                "ts": (started - self._origin_ns) / 1000,
+                "dur": elapsed / 1000,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": {"run": self.runs},
+            })
+
+    def span(self, name: str):
+        return self._span(name)
+
+    def begin_run(self) -> None:
+        self._current = defaultdict(float)
+        self._counts = defaultdict(int)
+
+    def end_run(self) -> None:
+        self.last_run = dict(self._current)
+        self.last_counts = dict(self._counts)
+        for name, milliseconds in self.last_run.items():
+            self._history[name].append(milliseconds)
+        self.runs += 1
+
+    def percentiles(self, quantiles=(50, 90, 99)) -> Dict[str, Dict[int, float]]:
+        summary = {}
+        for name, samples in self._history.items():
+            ordered = sorted(samples)
+            summary[name] = {
+                q: ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+                for q in quantiles
+            }
+        return summary
+
+    def to_chrome_trace(self) -> str:
+        return json.dumps({"traceEvents": list(self._events), "displayTimeUnit": "ms"})
+
+@contextmanager
+def profile_run(profiler: Optional[Profiler]) -> Iterator[bool]:
+    # Fragment reruns open their own run; inside a full rerun they join it.
+    # Yields whether this block owns the run, i.e. whether the run's numbers
+    # are final once it exits.
+    if profiler is None or _active_profiler.get() is profiler:
+        yield False
+        return
+
+    token = _active_profiler.set(profiler)
+    profiler.begin_run()
+    try:
+        yield True
+    finally:
+        profiler.end_run()
+        _active_profiler.reset(token)
+
+def span(name: str):
+    profiler = _active_profiler.get()
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name)
@@ -0,0 +1,107 @@
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from .batch import size_requests
+
+SIZE_PATH = "/v1/size"
+HEALTH_PATH = "/health"
+NDJSON_TYPE = "application/x-ndjson"
+JSON_TYPE = "application/json"
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+class SizingRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "TradeSizeServer/1.0"
+    verbose = False
+
+    def do_GET(self):
+        if self.path == HEALTH_PATH:
+            self._send(200, JSON_TYPE, b'{"status":"ok"}')
+        else:
+            self._send_error(404, "مسیر پیدا نشد.")
+
+    def do_POST(self):
+        if self.path != SIZE_PATH:
+            self._send_error(404, "مسیر پیدا نشد.")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_error(400, "هدر Content-Length معتبر نیست.")
+            return
+        if length > MAX_BODY_BYTES:
+            self._send_error(413, "حجم درخواست بیش از حد مجاز است.")
+            return
+        body = self.rfile.read(length)
+
+        ndjson = NDJSON_TYPE in (self.headers.get("Content-Type") or "")
+        try:
+            if ndjson:
+                requests = [json.loads(line) for line in body.splitlines() if line.strip()]
+            else:
+                requests = json.loads(body)
+                if not isinstance(requests, list):
+                    requests = [requests]
+        except ValueError:
+            self._send_error(400, "بدنه درخواست JSON معتبر نیست.")
+            return
+
+        responses = size_requests(requests)
+        # NaN and Infinity are not JSON; size_requests never returns them, and
+        # if that ever breaks the request fails instead of emitting them.
+        try:
+            if ndjson:
+                payload = "".join(json.dumps(response, ensure_ascii=False, allow_nan=False) + "\n" for response in responses)
+            else:
+                payload = json.dumps(responses, ensure_ascii=False, allow_nan=False)
+        except ValueError:
+            self._send_error(500, "نتیجه محاسبه عدد معتبر نیست.")
+            return
+        self._send(200, NDJSON_TYPE if ndjson else JSON_TYPE, payload.encode("utf-8"))
+
+    def _send_error(self, status: int, message: str):
+        self._send(status, JSON_TYPE, json.dumps({"error": message}, ensure_ascii=False).encode("utf-8"))
+
+    def _send(self, status: int, content_type: str, payload: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+def create_server(host: str = "127.0.0.1", port: int = 8765, verbose: bool = False) -> ThreadingHTTPServer:
+    handler = type("Handler", (SizingRequestHandler,), {"verbose": verbose})
+    return ThreadingHTTPServer((host, port), handler)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m trade_size.server",
+        description=f"سرویس HTTP محلی برای محاسبه گروهی سایز پوزیشن (POST {SIZE_PATH})."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--verbose", action="store_true", help="چاپ لاگ هر درخواست")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, args.verbose)
+    print(f"🚀 سرویس روی http://{args.host}:{args.port}{SIZE_PATH} آماده است.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+from typing import TYPE_CHECKING, Tuple
+
+from .engine import calculate_position_sizes
+from .validation import MAX_LEVERAGE
+
+if TYPE_CHECKING:
+    import numpy as np
+
+def sweep_stop_loss_risk(
+    capital: float,
+    stop_loss_percentages,
+    risk_percentages,
+    leverage: float = 1.0
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    stop_loss = np.asarray(stop_loss_percentages, dtype=np.float64)[:, np.newaxis]
+    risk = np.asarray(risk_percentages, dtype=np.float64)[np.newaxis, :]
+    _, position_size, margin_required = calculate_position_sizes(capital, stop_loss, risk, leverage)
+    return position_size, margin_required
+
+def sweep_leverage(
+    capital: float,
+    stop_loss_percentage: float,
+    risk_percentages,
+    leverages=None
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    if leverages is None:
+        leverages = np.arange(1, MAX_LEVERAGE + 1, dtype=np.float64)
+    leverages = np.asarray(leverages, dtype=np.float64)
+    risk = np.asarray(risk_percentages, dtype=np.float64)[:, np.newaxis]
+    _, _, margin_required = calculate_position_sizes(capital, stop_loss_percentage, risk, leverages[np.newaxis, :])
+    return leverages, margin_required
+
+def _block_starts(length: int, max_blocks: int) -> "np.ndarray":
+    import numpy as np
+
+    blocks = min(length, max_blocks)
+    return np.unique(np.linspace(0, length, blocks, endpoint=False).astype(np.int64))
+
+def downsample_axis(labels, max_blocks: int) -> "np.ndarray":
+    import numpy as np
+
+    labels = np.asarray(labels, dtype=np.float64)
+    starts = _block_starts(len(labels), max_blocks)
+    return np.add.reduceat(labels, starts) / np.diff(np.append(starts, len(labels)))
+
+def downsample_grid(
+    values: "np.ndarray",
+    row_labels: "np.ndarray",
+    column_labels: "np.ndarray",
+    max_rows: int,
+    max_columns: int
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    row_starts = _block_starts(values.shape[0], max_rows)
+    column_starts = _block_starts(values.shape[1], max_columns)
+    row_sizes = np.diff(np.append(row_starts, values.shape[0]))
+    column_sizes = np.diff(np.append(column_starts, values.shape[1]))
+
+    # Block means over uneven blocks: two reduceat passes, then divide by
+    # the block areas.
+    sums = np.add.reduceat(np.add.reduceat(values, row_starts, axis=0), column_starts, axis=1)
+    means = sums / np.outer(row_sizes, column_sizes)
+
+    return means, downsample_axis(row_labels, max_rows), downsample_axis(column_labels, max_columns)
@@ -0,0 +1,60 @@
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from .engine import calculate_position_sizes
+from .grid import RiskGrid
+from .incremental import IncrementalSizer
+from .profiling import span
+from .validation import validate_inputs
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def create_risk_management_table(
+    capital: float, 
+    stop_loss_percentage: float, 
+    risk_levels: List[float],
+    leverage: float = 1.0,
+    sizer: Optional[IncrementalSizer] = None,
+    grid: Optional[RiskGrid] = None
+) -> Tuple[Optional["pd.DataFrame"], Optional[str]]:
+    
+    error = validate_inputs(capital, stop_loss_percentage, risk_levels, leverage)
+    if error:
+        return None, error
+    
+    import numpy as np
+    import pandas as pd
+    
+    try:
+        sizes = None
+        if grid is not None:
+            with span("grid_lookup"):
+                sizes = grid.lookup(capital, stop_loss_percentage, risk_levels, leverage)
+        
+        if sizes is None:
+            size = calculate_position_sizes if sizer is None else sizer.size
+            with span("engine"):
+                sizes = size(capital, stop_loss_percentage, risk_levels, leverage)
+        
+        dollar_risk, position_size, margin_required = sizes
+        
+        columns = [f"{risk_percent}%" for risk_percent in risk_levels]
+        
+        if leverage > 1:
+            rows = [dollar_risk, position_size, margin_required]
+            index_labels = [
+                '💰 میزان ریسک',
+                '📊 سایز پوزیشن',
+                '💳 مارجین لازم (با اهرم)'
+            ]
+        else:
+            rows = [dollar_risk, position_size]
+            index_labels = ['💰 میزان ریسک', '📊 سایز پوزیشن']
+        
+        with span("dataframe_build"):
+            df = pd.DataFrame(np.vstack(rows), index=index_labels, columns=columns)
+        
+        return df, None
+        
+    except (ValueError, ZeroDivisionError, FloatingPointError) as e:
+        return None, f"خطا در محاسبات: {str(e)}"
@@ -0,0 +1,87 @@
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CAPITAL_ERROR = "سرمایه باید بیشتر از صفر باشد."
+STOP_LOSS_MIN_ERROR = "درصد حد ضرر باید بیشتر از صفر باشد."
+STOP_LOSS_MAX_ERROR = "درصد حد ضرر نمی‌تواند بیشتر یا مساوی ۱۰۰٪ باشد."
+LEVERAGE_MIN_ERROR = "اهرم باید حداقل ۱ باشد."
+LEVERAGE_MAX_ERROR = "اهرم نمی‌تواند بیشتر از ۱۲۵ باشد."
+RISK_EMPTY_ERROR = "لطفاً حداقل یک سطح ریسک وارد کنید."
+RISK_MIN_ERROR = "تمام سطوح ریسک باید بیشتر از صفر باشند."
+RISK_MAX_ERROR = "سطوح ریسک نمی‌توانند بیشتر یا مساوی ۱۰۰٪ باشند."
+NOT_A_NUMBER_ERROR = "همه مقادیر باید عدد معتبر باشند."
+
+MAX_LEVERAGE = 125
+
+def validate_inputs(capital: float, stop_loss_percentage: float, risk_levels: List[float], leverage: float) -> Optional[str]:
+    if capital <= 0:
+        return CAPITAL_ERROR
+    
+    if stop_loss_percentage <= 0:
+        return STOP_LOSS_MIN_ERROR
+    
+    if stop_loss_percentage >= 100:
+        return STOP_LOSS_MAX_ERROR
+    
+    if leverage < 1:
+        return LEVERAGE_MIN_ERROR
+    
+    if leverage > MAX_LEVERAGE:
+        return LEVERAGE_MAX_ERROR
+    
+    if len(risk_levels) == 0:
+        return RISK_EMPTY_ERROR
+    
+    if hasattr(risk_levels, "dtype"):
+        return _validate_risk_array(risk_levels)
+    
+    for risk in risk_levels:
+        if risk <= 0:
+            return RISK_MIN_ERROR
+        if risk >= 100:
+            return RISK_MAX_ERROR
+    
+    return None
+
+def _validate_risk_array(risk_levels: "np.ndarray") -> Optional[str]:
+    import numpy as np
+
+    # Same result as the loop: the first out-of-range level decides.
+    too_low = risk_levels <= 0
+    failing = too_low | (risk_levels >= 100)
+    if not failing.any():
+        return None
+    return RISK_MIN_ERROR if too_low[np.argmax(failing)] else RISK_MAX_ERROR
+
+def validate_inputs_batch(capital, stop_loss_percentage, risk_percentages, leverage) -> "np.ndarray":
+    import numpy as np
+
+    capital = np.asarray(capital, dtype=np.float64)
+    stop_loss_percentage = np.asarray(stop_loss_percentage, dtype=np.float64)
+    risk_percentages = np.asarray(risk_percentages, dtype=np.float64)
+    leverage = np.asarray(leverage, dtype=np.float64)
+
+    # Same precedence as validate_inputs: the first failing check wins.
+    conditions = [
+        ~(np.isfinite(capital) & np.isfinite(stop_loss_percentage) & np.isfinite(risk_percentages) & np.isfinite(leverage)),
+        capital <= 0,
+        stop_loss_percentage <= 0,
+        stop_loss_percentage >= 100,
+        leverage < 1,
+        leverage > MAX_LEVERAGE,
+        risk_percentages <= 0,
+        risk_percentages >= 100,
+    ]
+    messages = [
+        NOT_A_NUMBER_ERROR,
+        CAPITAL_ERROR,
+        STOP_LOSS_MIN_ERROR,
+        STOP_LOSS_MAX_ERROR,
+        LEVERAGE_MIN_ERROR,
+        LEVERAGE_MAX_ERROR,
+        RISK_MIN_ERROR,
+        RISK_MAX_ERROR,
+    ]
+    return np.select(conditions, messages, default=None).astype(object)